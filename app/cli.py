@@ -0,0 +1,134 @@
+"""Headless batch entry point: ``python -m app.cli claims.xlsx --photos photos --output out``.
+
+Progress is written to stdout as one JSON object per line; log messages go
+to stderr. Heavy modules are only imported once the arguments are valid.
+"""
+import argparse
+import json
+import sys
+import threading
+
+from app.core.batch_output import BATCH_OUTPUT_MODES
+
+EXIT_OK = 0
+EXIT_CLAIMS_FAILED = 1
+EXIT_USAGE = 2
+EXIT_FATAL = 3
+EXIT_PREFLIGHT_FAILED = 4
+EXIT_INTERRUPTED = 130
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m app.cli', description="Generate inspection reports without the GUI.")
+    parser.add_argument('input', nargs='*',
+                        help="Claim data files, folders or glob patterns (.csv or .xlsx); all are combined into one batch")
+    parser.add_argument('--watch', metavar='INBOX',
+                        help="Keep running and render every spreadsheet that arrives in INBOX")
+    parser.add_argument('--photos', help="Photos directory")
+    parser.add_argument('--output', help="Output directory (defaults to CONFIG['OUTPUT_DIR'])")
+    parser.add_argument('--workers', type=int, help="Claims rendered concurrently (defaults to CONFIG['RENDER_WORKERS'])")
+    parser.add_argument('--incremental', action=argparse.BooleanOptionalAction, default=None,
+                        help="Skip claims whose existing report is still current")
+    parser.add_argument('--backend', choices=['auto', 'pdfkit', 'wkhtmltopdf-batch', 'xhtml2pdf'],
+                        help="PDF backend (defaults to CONFIG['PDF_BACKEND'])")
+    parser.add_argument('--batch-output', choices=BATCH_OUTPUT_MODES,
+                        help="Write one file per claim, one merged PDF or one zip (defaults to CONFIG['BATCH_OUTPUT'])")
+    parser.add_argument('--preflight', action='store_true',
+                        help="Validate claims and photos first and stop if any errors are found")
+    parser.add_argument('--quiet', action='store_true', help="Only print errors to stderr")
+    return parser
+
+
+class JsonLinesWriter:
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+        self._lock = threading.Lock()
+
+    def __call__(self, event: dict):
+        line = json.dumps(event, default=str)
+        with self._lock:
+            self.stream.write(line + '\n')
+            self.stream.flush()
+
+
+def watch(engine, config: dict, args, output_dir: str, emit: JsonLinesWriter) -> int:
+    from app.core.watcher import InboxWatcher
+
+    settings = config.get('WATCH', {})
+    watcher = InboxWatcher(
+        engine,
+        args.watch,
+        output_dir,
+        args.photos,
+        poll_seconds=settings.get('poll_seconds', 2.0),
+        settle_seconds=settings.get('settle_seconds', 5.0),
+        workers=args.workers,
+        progress_callback=emit
+    )
+    emit({'event': 'watch', 'inbox': args.watch, 'backend': engine.renderer.name})
+    watcher.run()
+    return EXIT_OK
+
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if bool(args.input) == (args.watch is not None):
+        parser.error("give either an input file or --watch INBOX")
+    if args.watch and args.preflight:
+        parser.error("--preflight cannot be combined with --watch")
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    emit = JsonLinesWriter()
+    try:
+        import logging
+        from config.settings import CONFIG
+        from app.core.report_engine import InspectionReportEngine
+
+        config = dict(CONFIG)
+        if args.backend:
+            config['PDF_BACKEND'] = args.backend
+        if args.batch_output:
+            config['BATCH_OUTPUT'] = {**config.get('BATCH_OUTPUT', {}), 'mode': args.batch_output}
+        if args.watch:
+            # Keep photo indexes between jobs and only rescan folders that changed.
+            config['PHOTO_INDEX'] = {**config.get('PHOTO_INDEX', {}), 'check_mtime': True}
+        engine = InspectionReportEngine(config)
+        if args.quiet:
+            engine.logger.setLevel(logging.ERROR)
+
+        output_dir = args.output or config['OUTPUT_DIR']
+        data_files = args.input[0] if len(args.input) == 1 else args.input
+        if args.watch:
+            return watch(engine, config, args, output_dir, emit)
+        if args.preflight:
+            report = engine.preflight(data_files, output_dir, args.photos)
+            emit({'event': 'preflight', **report})
+            if not report['ok']:
+                return EXIT_PREFLIGHT_FAILED
+
+        emit({'event': 'start', 'input': data_files, 'backend': engine.renderer.name})
+        reports = engine.process_claims(
+            data_files,
+            output_dir,
+            args.photos,
+            workers=args.workers,
+            incremental=args.incremental,
+            progress_callback=emit
+        )
+    except KeyboardInterrupt:
+        emit({'event': 'interrupted'})
+        return EXIT_INTERRUPTED
+    except Exception as e:
+        emit({'event': 'fatal', 'error': str(e)})
+        return EXIT_FATAL
+
+    summary = dict(engine.last_batch_summary or {})
+    summary.pop('per_claim', None)
+    emit({'event': 'summary', 'reports': len(reports), **summary})
+    return EXIT_CLAIMS_FAILED if summary.get('failed') else EXIT_OK
+
+
+if __name__ == '__main__':
+    sys.exit(main())
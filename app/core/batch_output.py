@@ -0,0 +1,140 @@
+import os
+import zipfile
+from pathlib import Path
+from typing import List, Optional, Union
+
+BATCH_OUTPUT_MODES = ('separate', 'merged-pdf', 'zip')
+
+
+class BatchOutput:
+    """Collects the per-claim PDFs of one batch into a single file.
+
+    The target is written under a ``.part`` name and only moved into place
+    by ``close()``, so a failed batch never leaves a truncated file behind.
+    """
+
+    suffix = ''
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.partial_path = self.path.with_name(self.path.name + '.part')
+        self.count = 0
+
+    def add(self, report_path: Path, title: str):
+        raise NotImplementedError
+
+    def close(self) -> Optional[Path]:
+        raise NotImplementedError
+
+    def abort(self):
+        self.partial_path.unlink(missing_ok=True)
+
+
+class MergedPdfOutput(BatchOutput):
+    """One PDF with a bookmark per claim.
+
+    pypdf keeps a document in memory until it is written, so reports are
+    merged in slices of ``slice_size``: each full slice is written to disk
+    with its byte-identical images and fonts (header, footer, the signature
+    block) collapsed into a single object, and ``close()`` merges the slices.
+    Memory therefore peaks at one slice of reports or at the deduplicated
+    size of the final file, not at the sum of all reports.
+    """
+
+    suffix = '.pdf'
+
+    def __init__(self, path: Union[str, Path], slice_size: int = 100):
+        super().__init__(path)
+        try:
+            from pypdf import PdfWriter
+        except ImportError:
+            raise RuntimeError("Merged PDF output needs pypdf: pip install pypdf")
+        self._writer_class = PdfWriter
+        self.slice_size = max(1, slice_size)
+        self.slices: List[Path] = []
+        self.writer = PdfWriter()
+
+    def add(self, report_path: Path, title: str):
+        first_page = len(self.writer.pages)
+        self.writer.append(str(report_path), import_outline=False)
+        self.writer.add_outline_item(title, first_page)
+        self.count += 1
+        if self.count % self.slice_size == 0:
+            self._write_slice()
+
+    def _write_slice(self):
+        slice_path = self.path.with_name(f"{self.path.name}.part{len(self.slices) + 1}")
+        self._write(self.writer, slice_path)
+        self.slices.append(slice_path)
+        self.writer = self._writer_class()
+
+    def close(self) -> Optional[Path]:
+        if not self.count:
+            return None
+        if self.slices:
+            if len(self.writer.pages):
+                self._write_slice()
+            # Appending a slice brings its bookmarks along.
+            self.writer = self._writer_class()
+            for slice_path in self.slices:
+                self.writer.append(str(slice_path))
+        self._write(self.writer, self.partial_path)
+        os.replace(self.partial_path, self.path)
+        self._remove_slices()
+        return self.path
+
+    def abort(self):
+        super().abort()
+        self._remove_slices()
+
+    def _remove_slices(self):
+        for slice_path in self.slices:
+            slice_path.unlink(missing_ok=True)
+        self.slices = []
+
+    @staticmethod
+    def _write(writer, path: Path):
+        try:
+            writer.compress_identical_objects(remove_duplicates=True, remove_unreferenced=True)
+        except TypeError:  # Older pypdf releases name these remove_identicals and remove_orphans
+            writer.compress_identical_objects(remove_identicals=True, remove_orphans=True)
+        with open(path, 'wb') as output:
+            writer.write(output)
+
+
+class ZipOutput(BatchOutput):
+    """Zip archive streamed to disk as each report finishes."""
+
+    suffix = '.zip'
+
+    def __init__(self, path: Union[str, Path]):
+        super().__init__(path)
+        # PDFs are already compressed, so members are stored rather than deflated again.
+        self.archive = zipfile.ZipFile(self.partial_path, 'w', compression=zipfile.ZIP_STORED)
+
+    def add(self, report_path: Path, title: str):
+        self.archive.write(report_path, arcname=report_path.name)
+        self.count += 1
+
+    def close(self) -> Optional[Path]:
+        self.archive.close()
+        if not self.count:
+            self.abort()
+            return None
+        os.replace(self.partial_path, self.path)
+        return self.path
+
+    def abort(self):
+        self.archive.close()
+        super().abort()
+
+
+def open_batch_output(mode: str, output_dir: Union[str, Path], filename: str,
+                      merge_slice: int = 100) -> Optional[BatchOutput]:
+    if mode == 'separate':
+        return None
+    if mode == 'merged-pdf':
+        return MergedPdfOutput(Path(output_dir) / f"{filename}{MergedPdfOutput.suffix}", merge_slice)
+    if mode == 'zip':
+        return ZipOutput(Path(output_dir) / f"{filename}{ZipOutput.suffix}")
+    raise ValueError(f"Unknown batch output mode: {mode}")
@@ -0,0 +1,283 @@
+import glob
+import importlib.util
+import json
+import logging
+import math
+import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, List, Optional, Sequence, Tuple, Union
+
+from app.core.journal import file_checksum
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+CLAIM_COLUMN = 'CLAIM #'
+DATA_SUFFIXES = ('.csv', '.xlsx', '.xlsm')
+CACHE_VERSION = 1
+
+DataFiles = Union[str, Path, Sequence[Union[str, Path]]]
+
+
+def resolve_data_files(data_file: DataFiles) -> List[Path]:
+    """Expand a file, directory, glob pattern or a list of them into claim data files, in order."""
+    items = [data_file] if isinstance(data_file, (str, Path)) else list(data_file)
+    files: List[Path] = []
+    for item in items:
+        path = Path(item)
+        if path.is_dir():
+            matches = sorted(p for p in path.iterdir() if _is_data_file(p))
+        elif not path.exists() and any(char in str(item) for char in '*?['):
+            matches = sorted(p for p in map(Path, glob.glob(str(item), recursive=True)) if _is_data_file(p))
+            if not matches:
+                raise FileNotFoundError(f"No claim data files match: {item}")
+        elif path.exists():
+            matches = [path]
+        else:
+            raise FileNotFoundError(f"Input file not found: {path}")
+        files.extend(match for match in matches if match not in files)
+    if not files:
+        raise FileNotFoundError(f"No claim data files found in: {', '.join(str(item) for item in items)}")
+    return files
+
+
+def _is_data_file(path: Path) -> bool:
+    # Skips Excel lock files (~$Book.xlsx) and hidden files next to the real workbooks.
+    return path.is_file() and path.suffix.lower() in DATA_SUFFIXES and not path.name.startswith(('~$', '.'))
+
+
+def worksheet_rows(worksheet) -> Tuple[Optional[List], Iterator[tuple]]:
+    """Header and non-empty rows of an openpyxl worksheet, rows trimmed to the header width."""
+    rows = worksheet.iter_rows(values_only=True)
+    header = next(rows, None)
+    if header is None:
+        return None, iter(())
+    columns = [
+        name if name is not None else f"Unnamed: {idx}"
+        for idx, name in enumerate(header)
+    ]
+    width = len(columns)
+    return columns, (row[:width] for row in rows if not all(value is None for value in row))
+
+
+def column_key(name) -> str:
+    return str(name).strip().upper()
+
+
+def claim_keys(column: 'pd.Series') -> 'pd.Series':
+    """Claim numbers compared ignoring case and spaces; 12345 from Excel matches "12345" from a CSV."""
+    import pandas as pd
+
+    values = column.astype(object)
+    keys = values.where(values.notna()).astype('string').str.strip().str.upper()
+    numbers = pd.to_numeric(values, errors='coerce')
+    whole = numbers.notna() & numbers.mod(1).eq(0)
+    keys[whole] = numbers[whole].astype('int64').astype('string')
+    return keys.mask(keys.eq(''))
+
+
+def claim_key(value) -> Optional[str]:
+    """``claim_keys`` for a single value, for claims that are streamed rather than loaded as a table."""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    key = str(value).strip().upper()
+    try:
+        number = float(key)
+    except ValueError:
+        return key or None
+    return str(int(number)) if number.is_integer() else key
+
+
+class ParsedFileCache:
+    """Parsed claim files stored as Parquet or Feather, keyed by the SHA-256 of the source file.
+
+    Sheets whose columns mix value types cannot be stored by pyarrow; those
+    files are simply parsed again next time.
+    """
+
+    def __init__(self, cache_dir: Union[str, Path], file_format: str = 'parquet'):
+        if file_format not in ('parquet', 'feather'):
+            raise ValueError(f"Unknown claim cache format: {file_format}")
+        self.cache_dir = Path(cache_dir)
+        self.file_format = file_format
+
+    @staticmethod
+    def available() -> bool:
+        return importlib.util.find_spec('pyarrow') is not None
+
+    def _entry(self, digest: str, variant: str) -> Path:
+        return self.cache_dir / f"{digest}-{variant}-v{CACHE_VERSION}"
+
+    def load(self, digest: str, variant: str) -> Optional[List['pd.DataFrame']]:
+        import pandas as pd
+
+        entry = self._entry(digest, variant)
+        try:
+            with open(entry / 'sheets.json', encoding='utf-8') as handle:
+                sheets = json.load(handle)
+            read = pd.read_parquet if self.file_format == 'parquet' else pd.read_feather
+            return [read(entry / f"{idx}.{self.file_format}") for idx in range(len(sheets))]
+        except (OSError, ValueError):
+            return None
+
+    def store(self, digest: str, variant: str, sheets: List[str], frames: List['pd.DataFrame']):
+        entry = self._entry(digest, variant)
+        if entry.exists():
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix='.partial-', dir=self.cache_dir))
+        try:
+            for idx, frame in enumerate(frames):
+                target = staging / f"{idx}.{self.file_format}"
+                if self.file_format == 'parquet':
+                    frame.to_parquet(target, index=False)
+                else:
+                    frame.reset_index(drop=True).to_feather(target)
+            # Written last, so an entry without it is never read.
+            with open(staging / 'sheets.json', 'w', encoding='utf-8') as handle:
+                json.dump(sheets, handle)
+            os.replace(staging, entry)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+
+class ClaimSources:
+    """One ordered claim table built from several CSV/XLSX files and all of their sheets.
+
+    Files are parsed in parallel and concatenated in the order given, sheets
+    in workbook order. Column names are matched ignoring case and
+    surrounding spaces, columns missing from a file are left blank, and a
+    claim number seen more than once keeps only the row selected by
+    ``keep``. A single CSV or single-sheet workbook without a cache is not
+    combined at all and is streamed by the engine as before; repeated claim
+    numbers in it always keep the first row, since later rows are not read
+    yet when it is rendered.
+    """
+
+    def __init__(self, files: List[Path], all_sheets: bool = True, keep: str = 'last', workers: int = 4,
+                 cache: Optional[ParsedFileCache] = None, logger: Optional[logging.Logger] = None):
+        if keep not in ('first', 'last'):
+            raise ValueError(f"Unknown duplicate claim policy: {keep}")
+        self.files = files
+        self.all_sheets = all_sheets
+        self.keep = keep
+        self.workers = max(1, workers)
+        self.cache = cache
+        self.logger = logger or logging.getLogger(__name__)
+        self.duplicates = 0
+        self.duplicate_claims: List[str] = []
+        self._combined: Optional[bool] = None
+        self._frame: Optional['pd.DataFrame'] = None
+
+    @property
+    def combined(self) -> bool:
+        if self._combined is None:
+            self._combined = len(self.files) > 1 or self.cache is not None or self._sheet_count(self.files[0]) > 1
+        return self._combined
+
+    def _sheet_count(self, path: Path) -> int:
+        if path.suffix.lower() == '.csv' or not self.all_sheets:
+            return 1
+        import openpyxl
+        try:
+            workbook = openpyxl.load_workbook(path, read_only=True)
+        except Exception as e:
+            raise ValueError(f"Failed to load data file: {e}")
+        try:
+            return len(workbook.worksheets)
+        finally:
+            workbook.close()
+
+    def load(self) -> 'pd.DataFrame':
+        if self._frame is None:
+            try:
+                import pandas as pd
+            except ImportError:
+                raise ValueError("Combining claim files and sheets requires pandas")
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(self.files))) as executor:
+                frames = [frame for file_frames in executor.map(self._read_file, self.files) for frame in file_frames]
+            frame = self._union(frames) if frames else pd.DataFrame()
+            frame, self.duplicates = self._drop_duplicates(frame)
+            self.logger.info(f"Loaded {len(frame)} claims from {len(self.files)} files ({len(frames)} sheets)"
+                             + (f", dropped {self.duplicates} duplicate claim numbers" if self.duplicates else ""))
+            self._frame = frame
+        return self._frame
+
+    def _read_file(self, path: Path) -> List['pd.DataFrame']:
+        try:
+            digest = file_checksum(path) if self.cache is not None else None
+            variant = 'all' if self.all_sheets else 'first'
+            if digest is not None:
+                frames = self.cache.load(digest, variant)
+                if frames is not None:
+                    return frames
+            sheets, frames = self._parse(path)
+        except Exception as e:
+            raise ValueError(f"Failed to load data file {path.name}: {e}")
+        if digest is not None:
+            try:
+                self.cache.store(digest, variant, sheets, frames)
+            except Exception as e:
+                self.logger.debug(f"Not caching {path.name}: {e}")
+        return frames
+
+    def _parse(self, path: Path) -> Tuple[List[str], List['pd.DataFrame']]:
+        import pandas as pd
+
+        if path.suffix.lower() == '.csv':
+            frame = pd.read_csv(path, encoding='utf-8-sig')
+            return [path.name], [frame.rename(columns=str)]
+
+        import openpyxl
+        workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+        try:
+            worksheets = workbook.worksheets if self.all_sheets else workbook.worksheets[:1]
+            sheets, frames = [], []
+            for worksheet in worksheets:
+                columns, rows = worksheet_rows(worksheet)
+                if columns is None:
+                    continue
+                # Lookup or notes sheets are left out.
+                if CLAIM_COLUMN not in map(column_key, columns):
+                    self.logger.info(f"Skipping sheet '{worksheet.title}' in {path.name}: no {CLAIM_COLUMN} column")
+                    continue
+                sheets.append(worksheet.title)
+                frames.append(pd.DataFrame(list(rows), columns=[str(name) for name in columns]))
+            if not frames and worksheets:
+                # Without any claim sheet the first one is still read, so validation reports what is missing.
+                columns, rows = worksheet_rows(worksheets[0])
+                if columns is not None:
+                    sheets.append(worksheets[0].title)
+                    frames.append(pd.DataFrame(list(rows), columns=[str(name) for name in columns]))
+            return sheets, frames
+        finally:
+            workbook.close()
+
+    @staticmethod
+    def _union(frames: List['pd.DataFrame']) -> 'pd.DataFrame':
+        import pandas as pd
+
+        names = {CLAIM_COLUMN: CLAIM_COLUMN}
+        aligned = []
+        for frame in frames:
+            columns = []
+            for column in frame.columns:
+                columns.append(names.setdefault(column_key(column), str(column).strip()))
+            frame = frame.set_axis(columns, axis=1)
+            # Object columns keep whole numbers as ints where another file lacks the column.
+            aligned.append(frame.loc[:, ~frame.columns.duplicated()].astype(object))
+        return pd.concat(aligned, ignore_index=True, sort=False)
+
+    def _drop_duplicates(self, frame: 'pd.DataFrame') -> Tuple['pd.DataFrame', int]:
+        if CLAIM_COLUMN not in frame.columns:
+            return frame, 0
+        keys = claim_keys(frame[CLAIM_COLUMN])
+        duplicated = keys.notna() & keys.duplicated(keep=self.keep)
+        dropped = int(duplicated.sum())
+        self.duplicate_claims = sorted(set(keys[duplicated]))
+        if dropped:
+            frame = frame.loc[~duplicated.to_numpy()].reset_index(drop=True)
+        return frame, dropped
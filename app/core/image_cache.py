@@ -0,0 +1,90 @@
+import hashlib
+import io
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Tuple, Union
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow is optional; without it reports embed the original photos
+    Image = None
+    ImageOps = None
+
+
+class ImageCache:
+    """Content-addressed on-disk cache of photos resized to their printed size."""
+
+    def __init__(self, cache_dir: Union[str, Path], dpi: int = 150, quality: int = 80):
+        self.cache_dir = Path(cache_dir)
+        self.dpi = dpi
+        self.quality = quality
+        self._resolved: Dict[Tuple, str] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def available() -> bool:
+        return Image is not None
+
+    def target_size(self, size_in: Tuple[float, float]) -> Tuple[int, int]:
+        return (max(1, round(size_in[0] * self.dpi)), max(1, round(size_in[1] * self.dpi)))
+
+    def get(self, source: Union[str, Path], size_in: Tuple[float, float]) -> str:
+        source = Path(source)
+        stat = source.stat()
+        box = self.target_size(size_in)
+        memo_key = (str(source), stat.st_mtime_ns, stat.st_size, box)
+        with self._lock:
+            cached = self._resolved.get(memo_key)
+        if cached:
+            return cached
+
+        data = source.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+        suffix = '.png' if source.suffix.lower() == '.png' else '.jpg'
+        cached_path = self.cache_dir / digest[:2] / f"{digest}-{box[0]}x{box[1]}-q{self.quality}{suffix}"
+        # Marks images that re-encoding does not shrink (e.g. PNG banners), so later runs skip encoding them.
+        original_marker = cached_path.with_name(cached_path.name + '.original')
+        if original_marker.exists():
+            cached_path = source
+        elif not cached_path.exists():
+            encoded = self._encode(data, box, suffix)
+            if len(encoded) >= len(data):
+                self._write_atomic(original_marker, b'')
+                cached_path = source
+            else:
+                self._write_atomic(cached_path, encoded)
+
+        with self._lock:
+            self._resolved[memo_key] = str(cached_path)
+        return str(cached_path)
+
+    def _encode(self, data: bytes, box: Tuple[int, int], suffix: str) -> bytes:
+        with Image.open(io.BytesIO(data)) as image:
+            image = ImageOps.exif_transpose(image)
+            # Scale so neither side drops below the printed box; never upscale.
+            scale = max(box[0] / image.width, box[1] / image.height)
+            if scale < 1:
+                size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+                image = image.resize(size, Image.LANCZOS)
+            buffer = io.BytesIO()
+            if suffix == '.png':
+                image.save(buffer, format='PNG', optimize=True)
+            else:
+                if image.mode not in ('RGB', 'L'):
+                    image = image.convert('RGB')
+                image.save(buffer, format='JPEG', quality=self.quality, optimize=True, progressive=True)
+            return buffer.getvalue()
+
+    def _write_atomic(self, path: Path, data: bytes):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as tmp:
+                tmp.write(data)
+            os.replace(tmp_name, path)
+        except BaseException:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+            raise
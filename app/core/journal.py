@@ -0,0 +1,91 @@
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+
+def file_checksum(path: Union[str, Path]) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for block in iter(lambda: handle.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class CheckpointJournal:
+    """Append-only record of the claims a batch has finished, for resuming after a crash.
+
+    Every completed claim is written as one JSON line and synced to disk
+    before the next one is recorded, so at most the claims in flight are
+    lost. The journal is removed once a batch runs to the end, even if some
+    claims failed, so only cancelled or crashed batches are resumed.
+    """
+
+    FILENAME = '.inspection_journal.jsonl'
+
+    def __init__(self, output_dir: Union[str, Path]):
+        self.path = Path(output_dir) / self.FILENAME
+        self.entries: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._handle = None
+        if self.path.exists():
+            self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, encoding='utf-8') as handle:
+                for line in handle:
+                    try:
+                        entry = json.loads(line)
+                        self.entries[entry['row']] = entry
+                    except (ValueError, KeyError, TypeError):
+                        continue  # A line cut short by a crash
+        except OSError:
+            self.entries = {}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def completed_output(self, row_key: str) -> Optional[Path]:
+        with self._lock:
+            entry = self.entries.get(row_key)
+        if not entry:
+            return None
+        output_path = Path(entry['output'])
+        try:
+            if file_checksum(output_path) != entry['sha256']:
+                return None
+        except OSError:
+            return None
+        return output_path
+
+    def record(self, row_key: str, output_path: Path):
+        entry = {
+            'row': row_key,
+            'output': str(output_path),
+            'sha256': file_checksum(output_path),
+            'completed_at': datetime.now().isoformat(timespec='seconds')
+        }
+        line = json.dumps(entry) + '\n'
+        with self._lock:
+            if self._handle is None:
+                self._handle = open(self.path, 'a', encoding='utf-8')
+            self._handle.write(line)
+            self._handle.flush()
+            os.fsync(self._handle.fileno())
+            self.entries[row_key] = entry
+
+    def close(self):
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+
+    def discard(self):
+        self.close()
+        with self._lock:
+            self.entries = {}
+        self.path.unlink(missing_ok=True)
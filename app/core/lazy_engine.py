@@ -0,0 +1,84 @@
+import importlib
+import threading
+import time
+from typing import Dict, Optional
+
+
+class LazyEngine:
+    """Builds InspectionReportEngine on a background thread so the window can appear first.
+
+    Attribute access is forwarded to the engine and waits until it is ready,
+    so it must only happen off the Tk thread; use ``ready`` and ``error`` to
+    check progress from the UI. ``timings`` records how long each import and
+    initialisation step took, in seconds.
+    """
+
+    def __init__(self, config: dict, warm_up: bool = True):
+        self.config = config
+        self.warm_up = warm_up
+        self.timings: Dict[str, float] = {}
+        self._engine = None
+        self._error: Optional[BaseException] = None
+        self._done = threading.Event()
+        self._warmed = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self) -> 'LazyEngine':
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._load, name='engine-startup', daemon=True)
+                self._thread.start()
+        return self
+
+    def _timed(self, name: str, func):
+        started = time.perf_counter()
+        try:
+            return func()
+        finally:
+            self.timings[name] = round(time.perf_counter() - started, 4)
+
+    def _load(self):
+        try:
+            started = time.perf_counter()
+            # A plain import (not importlib) so PyInstaller still bundles the engine.
+            from app.core.report_engine import InspectionReportEngine
+            self.timings['import_engine'] = round(time.perf_counter() - started, 4)
+            self._engine = self._timed('init_engine', lambda: InspectionReportEngine(self.config))
+        except BaseException as e:
+            self._error = e
+        finally:
+            self._done.set()
+        if self.warm_up and self._error is None:
+            # Loaded now rather than when the first spreadsheet is opened; both are optional here.
+            for name in ('openpyxl', 'pandas'):
+                try:
+                    self._timed(f"import_{name}", lambda: importlib.import_module(name))
+                except ImportError:
+                    pass
+        self._warmed.set()
+
+    @property
+    def ready(self) -> bool:
+        return self._done.is_set() and self._error is None
+
+    @property
+    def error(self) -> Optional[BaseException]:
+        return self._error
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        self.start()
+        return self._done.wait(timeout)
+
+    def wait_warmed(self, timeout: Optional[float] = None) -> bool:
+        self.start()
+        return self._warmed.wait(timeout)
+
+    def get(self):
+        self.wait()
+        if self._error is not None:
+            raise RuntimeError(f"Report engine failed to start: {self._error}")
+        return self._engine
+
+    def __getattr__(self, name: str):
+        return getattr(self.get(), name)
@@ -0,0 +1,74 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Union
+
+
+def fingerprint(*parts) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(json.dumps(part, sort_keys=True, default=str).encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def file_signatures(paths: Iterable[Optional[str]]) -> list:
+    signatures = []
+    for path in paths:
+        if not path:
+            continue
+        try:
+            stat = os.stat(path)
+            signatures.append((str(path), stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            signatures.append((str(path), None, None))
+    return signatures
+
+
+class RenderManifest:
+    """Fingerprints of the reports rendered into an output directory, for incremental runs."""
+
+    FILENAME = '.inspection_manifest.json'
+
+    def __init__(self, output_dir: Union[str, Path]):
+        self.path = Path(output_dir) / self.FILENAME
+        self.entries: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        if self.path.exists():
+            try:
+                self.entries = json.loads(self.path.read_text(encoding='utf-8')).get('reports', {})
+            except (OSError, ValueError):
+                self.entries = {}
+
+    def current_output(self, key: str, claim_fingerprint: str) -> Optional[Path]:
+        with self._lock:
+            entry = self.entries.get(key)
+        if not entry or entry.get('fingerprint') != claim_fingerprint:
+            return None
+        output_path = Path(entry['output'])
+        return output_path if output_path.exists() else None
+
+    def record(self, key: str, claim_fingerprint: str, output_path: Path):
+        with self._lock:
+            self.entries[key] = {'fingerprint': claim_fingerprint, 'output': str(output_path)}
+            self._dirty = True
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = json.dumps({'version': 1, 'reports': self.entries}, indent=2, sort_keys=True)
+            self._dirty = False
+        fd, tmp_name = tempfile.mkstemp(dir=self.path.parent, prefix=self.path.name, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as tmp:
+                tmp.write(payload)
+            os.replace(tmp_name, self.path)
+        except BaseException:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+            raise
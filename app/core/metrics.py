@@ -0,0 +1,132 @@
+import json
+import math
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+class BatchMetrics:
+    """Stage timings, byte counts and image counts collected during one batch."""
+
+    FILENAME = 'batch_metrics.json'
+
+    def __init__(self):
+        self.started_at = datetime.now()
+        self._started = time.perf_counter()
+        self._finished: Optional[float] = None
+        self.batch_stages: Dict[str, float] = defaultdict(float)
+        self.claims: List[Dict] = []
+        self.combined_output: Optional[Dict] = None
+        self.resource_bundle: Optional[Dict] = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def new_claim(self, idx: int) -> Dict:
+        record = {'index': idx, 'status': 'failed', 'stages': defaultdict(float), 'images': 0, 'bytes': 0}
+        with self._lock:
+            self.claims.append(record)
+        return record
+
+    def count(self, status: str) -> int:
+        with self._lock:
+            return sum(1 for record in self.claims if record['status'] == status)
+
+    @contextmanager
+    def track(self, record: Dict):
+        self._local.record = record
+        try:
+            yield record
+        finally:
+            self._local.record = None
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def add_time(self, name: str, seconds: float, record: Optional[Dict] = None):
+        record = record or getattr(self._local, 'record', None)
+        if record is not None:
+            record['stages'][name] += seconds
+        else:
+            with self._lock:
+                self.batch_stages[name] += seconds
+
+    def timed_iter(self, items: Iterable, name: str) -> Iterator:
+        items = iter(items)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(items)
+            except StopIteration:
+                self.add_time(name, time.perf_counter() - start)
+                return
+            self.add_time(name, time.perf_counter() - start)
+            yield item
+
+    def finish(self):
+        self._finished = time.perf_counter()
+
+    def summary(self) -> Dict:
+        elapsed = (self._finished or time.perf_counter()) - self._started
+        with self._lock:
+            claims = sorted(self.claims, key=lambda record: record['index'])
+            batch_stages = dict(self.batch_stages)
+
+        stage_values = defaultdict(list)
+        for record in claims:
+            for name, seconds in record['stages'].items():
+                stage_values[name].append(seconds)
+        statuses = defaultdict(int)
+        for record in claims:
+            statuses[record['status']] += 1
+
+        return {
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'elapsed_seconds': round(elapsed, 3),
+            'claims': len(claims),
+            'generated': statuses['generated'],
+            'skipped': statuses['skipped'],
+            'failed': statuses['failed'],
+            'cancelled': statuses['cancelled'],
+            'claims_per_minute': round(len(claims) / elapsed * 60, 2) if elapsed > 0 else 0.0,
+            'bytes_written': sum(record['bytes'] for record in claims),
+            'images': sum(record['images'] for record in claims),
+            'combined_output': self.combined_output,
+            'resource_bundle': self.resource_bundle,
+            'batch_stages': {name: round(seconds, 4) for name, seconds in batch_stages.items()},
+            'stages': {
+                name: {
+                    'count': len(values),
+                    'total': round(sum(values), 4),
+                    'p50': round(percentile(values, 50), 4),
+                    'p95': round(percentile(values, 95), 4),
+                    'max': round(max(values), 4)
+                }
+                for name, values in stage_values.items()
+            },
+            'per_claim': [
+                {**record, 'stages': {name: round(seconds, 4) for name, seconds in record['stages'].items()}}
+                for record in claims
+            ]
+        }
+
+    def write(self, output_dir: Union[str, Path]) -> Path:
+        path = Path(output_dir) / self.FILENAME
+        path.write_text(json.dumps(self.summary(), indent=2), encoding='utf-8')
+        return path
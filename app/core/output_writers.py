@@ -0,0 +1,153 @@
+import errno
+import os
+import shutil
+import tempfile
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, Optional, Set, Union
+
+PublishCallback = Callable[[Optional[Exception]], None]
+
+
+def fsync_file(path: Path):
+    with open(path, 'rb+') as handle:
+        os.fsync(handle.fileno())
+
+
+def fsync_directory(path: Path):
+    # Persists the rename itself; directories cannot be opened this way on Windows.
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def move_atomic(source: Path, target: Path):
+    """Move ``source`` to ``target`` so readers only ever see the complete file."""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.replace(source, target)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        # Different filesystem (e.g. a network drive): copy next to the target, then rename there.
+        fd, tmp_name = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix='.part')
+        try:
+            with os.fdopen(fd, 'wb') as output, open(source, 'rb') as data:
+                shutil.copyfileobj(data, output, 1 << 20)
+                output.flush()
+                os.fsync(output.fileno())
+            os.replace(tmp_name, target)
+        except BaseException:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+            raise
+        source.unlink()
+    fsync_directory(target.parent)
+
+
+class OutputWriter:
+    """Reports are rendered into a local scratch file and published to their final path.
+
+    The default implementation publishes synchronously: the scratch file is
+    fsynced and moved into place atomically, so a failed or interrupted
+    render never leaves a truncated PDF in the output directory.
+    """
+
+    name = 'local'
+
+    def __init__(self, scratch_dir: Optional[Union[str, Path]] = None):
+        self.scratch_root = Path(scratch_dir) if scratch_dir else None
+        self._scratch: Optional[Path] = None
+        self._scratch_lock = threading.Lock()
+
+    def scratch_path(self, final_path: Path) -> Path:
+        with self._scratch_lock:
+            if self._scratch is None or not self._scratch.is_dir():
+                if self.scratch_root is not None:
+                    self.scratch_root.mkdir(parents=True, exist_ok=True)
+                self._scratch = Path(tempfile.mkdtemp(prefix='inspectionpro-scratch-', dir=self.scratch_root))
+            scratch = self._scratch
+        return scratch / f"{uuid.uuid4().hex}{final_path.suffix}"
+
+    def publish(self, scratch_path: Path, final_path: Path, callback: PublishCallback):
+        try:
+            fsync_file(scratch_path)
+            move_atomic(scratch_path, final_path)
+        except Exception as e:
+            self.discard(scratch_path)
+            callback(e)
+            return
+        callback(None)
+
+    def discard(self, scratch_path: Path):
+        try:
+            scratch_path.unlink(missing_ok=True)
+        except OSError:
+            pass
+
+    def flush(self):
+        with self._scratch_lock:
+            if self._scratch is not None:
+                shutil.rmtree(self._scratch, ignore_errors=True)
+                self._scratch = None
+
+
+class BackgroundOutputWriter(OutputWriter):
+    """Publishes on a small pool of copy threads so rendering never waits on slow storage.
+
+    At most ``max_pending`` reports wait to be copied; beyond that
+    ``publish`` blocks, which keeps scratch disk usage bounded.
+    """
+
+    name = 'background'
+
+    def __init__(self, scratch_dir: Optional[Union[str, Path]] = None, workers: int = 2, max_pending: int = 16):
+        super().__init__(scratch_dir)
+        self.executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='report-publish')
+        self._slots = threading.BoundedSemaphore(max(1, max_pending))
+        self._pending: Set[Future] = set()
+        self._pending_lock = threading.Lock()
+
+    def publish(self, scratch_path: Path, final_path: Path, callback: PublishCallback):
+        self._slots.acquire()
+        try:
+            future = self.executor.submit(super().publish, scratch_path, final_path, callback)
+        except BaseException:
+            self._slots.release()
+            raise
+        with self._pending_lock:
+            self._pending.add(future)
+        future.add_done_callback(self._done)
+
+    def _done(self, future: Future):
+        with self._pending_lock:
+            self._pending.discard(future)
+        self._slots.release()
+
+    def flush(self):
+        with self._pending_lock:
+            pending = list(self._pending)
+        wait(pending)
+        super().flush()
+
+
+def create_output_writer(settings: dict) -> OutputWriter:
+    backend = settings.get('backend', 'local')
+    if backend == 'local':
+        return OutputWriter(settings.get('scratch_dir'))
+    if backend == 'background':
+        return BackgroundOutputWriter(
+            settings.get('scratch_dir'),
+            workers=settings.get('workers', 2),
+            max_pending=settings.get('max_pending', 16)
+        )
+    raise ValueError(f"Unknown output writer backend: {backend}")
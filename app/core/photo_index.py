@@ -0,0 +1,247 @@
+import os
+import re
+from collections import deque
+from pathlib import Path
+from typing import Iterable, List, Dict, Optional, Tuple, Union
+
+IMAGE_SUFFIXES = ('.jpg', '.jpeg', '.png')
+
+ROOM_TYPES = [
+    ('BEDROOM1', ['bedroom1', 'master']),
+    ('BEDROOM2', ['bedroom2', 'second']),
+    ('KITCHEN', ['kitchen']),
+    ('LIVING', ['living', 'lounge']),
+    ('STORAGE', ['storage', 'basement'])
+]
+
+SPECIAL_IMAGES = {
+    'header_image': ['header'],
+    'footer_image': ['footer'],
+    'front_photo': ['front', 'facade']
+}
+
+
+class KeywordAutomaton:
+    """Aho-Corasick matcher: finds every keyword occurring in a text in one pass over it."""
+
+    def __init__(self, keywords: List[Tuple[str, int]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Optional[int]] = [None]
+        for keyword, value in keywords:
+            state = 0
+            for char in keyword:
+                if char not in self._goto[state]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(None)
+                    self._goto[state][char] = len(self._goto) - 1
+                state = self._goto[state][char]
+            self._output[state] = self._best(self._output[state], value)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, target in self._goto[state].items():
+                queue.append(target)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[target] = self._goto[fallback].get(char, 0) if state else 0
+                self._output[target] = self._best(self._output[target], self._output[self._fail[target]])
+
+    @staticmethod
+    def _best(first: Optional[int], second: Optional[int]) -> Optional[int]:
+        if first is None:
+            return second
+        return first if second is None else min(first, second)
+
+    def best_match(self, text: str) -> Optional[int]:
+        """Smallest value among the keywords found in ``text``, or None."""
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        best = None
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state] is not None and (best is None or output[state] < best):
+                best = output[state]
+                if best == 0:
+                    break
+        return best
+
+
+class RoomClassifier:
+    """Assigns each photo to at most one room, compiled once from the room rules.
+
+    Rules are ranked by ``priority`` (highest first, then rule order). All
+    keywords go into one Aho-Corasick automaton that scans the photo's file
+    name and parent folder name once; regex ``patterns`` are only tried for
+    rules that outrank the best keyword match.
+    """
+
+    def __init__(self, rules: List[Dict], max_photos: Optional[int] = 4, uncategorized: Optional[str] = None):
+        self.uncategorized = uncategorized
+        self.rooms: Dict[str, Optional[int]] = {}
+        for rule in rules:
+            self.rooms.setdefault(rule['room'], rule.get('max_photos', max_photos))
+        if uncategorized:
+            self.rooms.setdefault(uncategorized, max_photos)
+
+        ranked = sorted(rules, key=lambda rule: -rule.get('priority', 0))
+        self._labels = [rule['room'] for rule in ranked]
+        keywords = []
+        self._patterns: List[Tuple[int, re.Pattern]] = []
+        for rank, rule in enumerate(ranked):
+            if not rule.get('keywords') and not rule.get('patterns'):
+                raise ValueError(f"Room rule {rule['room']} has no keywords or patterns")
+            keywords.extend((keyword.lower(), rank) for keyword in rule.get('keywords', []))
+            try:
+                self._patterns.extend(
+                    (rank, re.compile(pattern, re.IGNORECASE | re.MULTILINE)) for pattern in rule.get('patterns', [])
+                )
+            except re.error as e:
+                raise ValueError(f"Invalid pattern in room rule {rule['room']}: {e}")
+        self._automaton = KeywordAutomaton(keywords)
+
+    @classmethod
+    def from_config(cls, settings: Optional[Dict]) -> 'RoomClassifier':
+        if not settings:
+            return cls([{'room': room, 'keywords': keywords} for room, keywords in ROOM_TYPES])
+        return cls(settings['rooms'], settings.get('max_photos', 4), settings.get('uncategorized'))
+
+    def classify(self, photo: Path) -> Optional[str]:
+        text = f"{photo.name}\n{photo.parent.name}"
+        best = self._automaton.best_match(text.lower())
+        for rank, pattern in self._patterns:
+            if best is not None and rank >= best:
+                break
+            if pattern.search(text):
+                best = rank
+                break
+        return self._labels[best] if best is not None else self.uncategorized
+
+
+def normalize_claim_number(value) -> str:
+    if value is None:
+        return ''
+    return re.sub(r'[^0-9A-Za-z]', '', str(value)).upper()
+
+
+class PhotoIndex:
+    """In-memory listing of the images under a photos directory, built with a single walk.
+
+    When ``claim_folder_pattern`` is given, top-level sub-folders whose name
+    matches it are treated as per-claim folders: they are recorded in
+    ``claim_folders`` by normalized claim number and left out of this index.
+    With ``claim_numbers`` only folders of those claims count; other matching
+    folders (``2024``, ``100CANON``) stay shared and are listed in
+    ``unclaimed_folders``.
+    """
+
+    def __init__(self, root: Union[str, Path], claim_folder_pattern: Optional[str] = None,
+                 room_classifier: Optional[RoomClassifier] = None,
+                 claim_numbers: Optional[Iterable[str]] = None):
+        self.root = Path(root)
+        self.room_classifier = room_classifier or RoomClassifier.from_config(None)
+        self.claim_folder_pattern = re.compile(claim_folder_pattern) if claim_folder_pattern else None
+        self.claim_numbers = frozenset(claim_numbers) if claim_numbers is not None else None
+        self.claim_folders: Dict[str, Path] = {}
+        self.unclaimed_folders: List[Path] = []
+        self.files: List[Path] = []
+        self._dir_mtimes: Dict[str, float] = {}
+        self._special: Dict[str, Optional[str]] = {}
+        self._rooms: Optional[List[Dict]] = None
+        self._lookups: Dict[Tuple[str, ...], Optional[str]] = {}
+        self.scan()
+
+    def scan(self):
+        files = []
+        dir_mtimes = {}
+        self.claim_folders = {}
+        self.unclaimed_folders = []
+        self._walk(self.root, files, dir_mtimes)
+        self.files = files
+        self._dir_mtimes = dir_mtimes
+        self._lookups = {}
+        self._special = {field: self.find(keywords) for field, keywords in SPECIAL_IMAGES.items()}
+        self._rooms = None
+
+    def _walk(self, directory: Path, files: List[Path], dir_mtimes: Dict[str, float]):
+        # Same pre-order traversal as Path.rglob so "first match" lookups are unchanged.
+        try:
+            dir_mtimes[str(directory)] = directory.stat().st_mtime
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except OSError:
+            return
+        subdirs = []
+        for entry in entries:
+            try:
+                if entry.is_dir():
+                    subdirs.append(entry)
+                elif Path(entry.name).suffix.lower() in IMAGE_SUFFIXES:
+                    files.append(Path(entry.path))
+            except OSError:
+                continue
+        for entry in subdirs:
+            if directory == self.root and self._register_claim_folder(entry):
+                continue
+            self._walk(Path(entry.path), files, dir_mtimes)
+
+    def _register_claim_folder(self, entry: os.DirEntry) -> bool:
+        if self.claim_folder_pattern is None:
+            return False
+        match = self.claim_folder_pattern.match(entry.name)
+        if not match:
+            return False
+        key = normalize_claim_number(match.group(0))
+        if self.claim_numbers is not None and key not in self.claim_numbers:
+            self.unclaimed_folders.append(Path(entry.path))
+            return False
+        self.claim_folders.setdefault(key, Path(entry.path))
+        return True
+
+    def claim_folder(self, claim_number) -> Optional[Path]:
+        key = normalize_claim_number(claim_number)
+        return self.claim_folders.get(key) if key else None
+
+    def is_stale(self) -> bool:
+        for directory, mtime in self._dir_mtimes.items():
+            try:
+                if os.stat(directory).st_mtime != mtime:
+                    return True
+            except OSError:
+                return True
+        return False
+
+    def find(self, keywords: Union[str, List[str]]) -> Optional[str]:
+        if isinstance(keywords, str):
+            keywords = [keywords]
+        key = tuple(kw.lower() for kw in keywords)
+        if key not in self._lookups:
+            self._lookups[key] = next(
+                (str(photo) for photo in self.files if any(kw in photo.name.lower() for kw in key)),
+                None
+            )
+        return self._lookups[key]
+
+    def room_photos(self) -> List[Dict]:
+        if self._rooms is None:
+            special_images = set(self._special.values())
+            rooms = self.room_classifier.rooms
+            buckets = {room_name: [] for room_name in rooms}
+            for photo in self.files:
+                photo_str = str(photo)
+                if photo_str in special_images:
+                    continue
+                room_name = self.room_classifier.classify(photo)
+                if room_name is not None:
+                    buckets[room_name].append(photo_str)
+            self._rooms = [
+                {'room': room_name, 'images': sorted(buckets[room_name])[:max_photos]}
+                for room_name, max_photos in rooms.items()
+                if buckets[room_name]
+            ]
+        return [{'room': room['room'], 'images': list(room['images'])} for room in self._rooms]
@@ -0,0 +1,83 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from PIL import Image
+except ImportError:  # Without Pillow images are only checked for a known file signature
+    Image = None
+
+REQUIRED_FIELDS = ('CLAIM #', 'INSURED/POLICYHOLDER', 'ADDRESS')
+
+IMAGE_SIGNATURES = (b'\xff\xd8\xff', b'\x89PNG\r\n\x1a\n')
+
+
+def validate_claim(claim: Dict) -> List[str]:
+    problems = [f"Missing {field}" for field in REQUIRED_FIELDS if claim.get(field) is None]
+    for field in ('INSURED/POLICYHOLDER', 'ADDRESS'):
+        value = claim.get(field)
+        if value is not None and not isinstance(value, str):
+            problems.append(f"{field} must be text, got {value!r}")
+    insured = claim.get('INSURED/POLICYHOLDER')
+    if isinstance(insured, str) and not insured.split():
+        problems.append("INSURED/POLICYHOLDER has no name")
+    return problems
+
+
+def check_image(path: str, min_size: Tuple[int, int]) -> Tuple[Optional[str], Optional[str]]:
+    """Return (error, warning) for one image; both are None when it is fine."""
+    try:
+        if Image is None:
+            with open(path, 'rb') as handle:
+                header = handle.read(8)
+            if not header.startswith(IMAGE_SIGNATURES):
+                return f"Not a JPEG or PNG image: {path}", None
+            return None, None
+        with Image.open(path) as image:
+            width, height = image.size
+            image.verify()
+    except Exception as e:
+        return f"Unreadable image {path}: {e}", None
+    if width < min_size[0] or height < min_size[1]:
+        return None, f"Low resolution image ({width}x{height}px): {path}"
+    return None, None
+
+
+def check_images(min_sizes: Dict[str, Tuple[int, int]],
+                 workers: int = 8) -> Dict[str, Tuple[Optional[str], Optional[str]]]:
+    paths = list(min_sizes)
+    if not paths:
+        return {}
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        return dict(zip(paths, executor.map(lambda path: check_image(path, min_sizes[path]), paths)))
+
+
+class PreflightReport:
+    """Problems found before rendering; serialisable with to_dict()."""
+
+    def __init__(self):
+        self._started = time.perf_counter()
+        self.claims = 0
+        self.images_checked = 0
+        self.errors: List[Dict] = []
+        self.warnings: List[Dict] = []
+
+    def error(self, row: Optional[int], claim_number, message: str):
+        self.errors.append({'row': row, 'claim': claim_number, 'message': message})
+
+    def warning(self, row: Optional[int], claim_number, message: str):
+        self.warnings.append({'row': row, 'claim': claim_number, 'message': message})
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def to_dict(self) -> Dict:
+        return {
+            'ok': self.ok,
+            'claims': self.claims,
+            'images_checked': self.images_checked,
+            'elapsed_seconds': round(time.perf_counter() - self._started, 3),
+            'errors': self.errors,
+            'warnings': self.warnings
+        }
@@ -0,0 +1,36 @@
+from html.parser import HTMLParser
+from typing import List
+
+OUTLINE_TAGS = ('h1', 'h2', 'h3')
+
+
+class _HeadingParser(HTMLParser):
+    def __init__(self):
+        super().__init__()
+        self.headings: List[str] = []
+        self._text: List[str] = []
+        self._depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in OUTLINE_TAGS:
+            self._depth += 1
+            self._text = []
+
+    def handle_endtag(self, tag):
+        if tag in OUTLINE_TAGS and self._depth:
+            self._depth -= 1
+            heading = ' '.join(''.join(self._text).split())
+            if heading:
+                self.headings.append(heading)
+
+    def handle_data(self, data):
+        if self._depth:
+            self._text.append(data)
+
+
+def html_outline(html: str) -> List[str]:
+    """Headings of a rendered report in document order, i.e. the sections a reader will see."""
+    parser = _HeadingParser()
+    parser.feed(html)
+    parser.close()
+    return parser.headings
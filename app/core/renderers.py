@@ -0,0 +1,169 @@
+import base64
+import mimetypes
+import re
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+PDF_DATE = re.compile(rb'/(CreationDate|ModDate)\s*\(D:(\d+)([^)]*)\)')
+FIXED_DATE = b'19700101000000'
+
+
+def stabilize_pdf_dates(path: Path):
+    """Overwrite the creation and modification dates of a PDF with a fixed date of the same length.
+
+    wkhtmltopdf stamps the wall-clock time into every file. Keeping the
+    length leaves the cross-reference offsets valid.
+    """
+    def fixed(match):
+        digits = match.group(2)
+        stamp = (FIXED_DATE + b'0' * len(digits))[:len(digits)]
+        return b'/%s (D:%s%s)' % (match.group(1), stamp, re.sub(rb'\d', b'0', match.group(3)))
+
+    path = Path(path)
+    data = path.read_bytes()
+    stable = PDF_DATE.sub(lambda match: fixed(match).ljust(len(match.group(0))), data)
+    if stable != data:
+        path.write_bytes(stable)
+
+
+class PdfRenderer:
+    """Converts rendered report HTML into PDF files."""
+
+    name = 'base'
+    batch_size = 1
+
+    def render(self, html: str, output_path: Path):
+        raise NotImplementedError
+
+    def render_batch(self, jobs: List[Tuple[str, Path]]) -> List[Optional[Exception]]:
+        errors = []
+        for html, output_path in jobs:
+            try:
+                self.render(html, output_path)
+                errors.append(None)
+            except Exception as e:
+                errors.append(e)
+        return errors
+
+
+class PdfkitRenderer(PdfRenderer):
+    """One wkhtmltopdf process per report, driven through pdfkit."""
+
+    name = 'pdfkit'
+
+    def __init__(self, wkhtmltopdf: str, options: Dict[str, str], deterministic: bool = False):
+        import pdfkit
+
+        self.pdfkit = pdfkit
+        self.configuration = pdfkit.configuration(wkhtmltopdf=wkhtmltopdf)
+        self.options = options
+        self.deterministic = deterministic
+
+    def render(self, html: str, output_path: Path):
+        self.pdfkit.from_string(html, str(output_path), configuration=self.configuration, options=self.options)
+        if self.deterministic:
+            stabilize_pdf_dates(output_path)
+
+
+class WkhtmltopdfBatchRenderer(PdfRenderer):
+    """Converts several reports per wkhtmltopdf process using --read-args-from-stdin.
+
+    Process spawn, WebKit start-up and font loading are paid once per batch
+    instead of once per report. Each report still gets its own PDF and its
+    own success or failure.
+    """
+
+    name = 'wkhtmltopdf-batch'
+
+    def __init__(self, wkhtmltopdf: str, options: Dict[str, str], batch_size: int = 8,
+                 deterministic: bool = False):
+        self.wkhtmltopdf = wkhtmltopdf
+        self.batch_size = max(1, batch_size)
+        self.deterministic = deterministic
+        self.args = []
+        for key, value in options.items():
+            self.args.append(f"--{key}")
+            if value:
+                self.args.append(str(value))
+
+    def render(self, html: str, output_path: Path):
+        error = self.render_batch([(html, output_path)])[0]
+        if error is not None:
+            raise error
+
+    def render_batch(self, jobs: List[Tuple[str, Path]]) -> List[Optional[Exception]]:
+        with tempfile.TemporaryDirectory(prefix='inspectionpro-') as scratch:
+            scratch = Path(scratch)
+            lines = []
+            for idx, (html, _) in enumerate(jobs):
+                source = scratch / f"{idx}.html"
+                source.write_text(html, encoding='utf-8')
+                lines.append(f"{self._quote(source)} {self._quote(scratch / f'{idx}.pdf')}\n")
+
+            process = subprocess.run(
+                [self.wkhtmltopdf, *self.args, '--read-args-from-stdin'],
+                input=''.join(lines),
+                capture_output=True,
+                text=True
+            )
+
+            errors = []
+            for idx, (_, output_path) in enumerate(jobs):
+                rendered = scratch / f"{idx}.pdf"
+                if rendered.exists() and rendered.stat().st_size > 0:
+                    if self.deterministic:
+                        stabilize_pdf_dates(rendered)
+                    shutil.move(str(rendered), str(output_path))
+                    errors.append(None)
+                else:
+                    detail = process.stderr.strip().splitlines()[-1:] or [f"exit code {process.returncode}"]
+                    errors.append(RuntimeError(f"wkhtmltopdf produced no output ({detail[0]})"))
+            return errors
+
+    @staticmethod
+    def _quote(path: Path) -> str:
+        # wkhtmltopdf splits stdin lines on spaces and honours double quotes and backslash escapes.
+        return '"' + str(path).replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+class Xhtml2pdfRenderer(PdfRenderer):
+    """Pure-Python fallback used when wkhtmltopdf is not installed."""
+
+    name = 'xhtml2pdf'
+
+    def __init__(self, deterministic: bool = False):
+        if deterministic:
+            # Fixed creation dates and document IDs, so identical HTML gives identical bytes.
+            from reportlab import rl_config
+            rl_config.invariant = 1
+
+    @staticmethod
+    def available() -> bool:
+        try:
+            import xhtml2pdf  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def render(self, html: str, output_path: Path):
+        from xhtml2pdf import pisa
+
+        with open(output_path, 'wb') as output:
+            result = pisa.CreatePDF(html, dest=output, encoding='utf-8', link_callback=self._inline_local_file)
+        if result.err:
+            Path(output_path).unlink(missing_ok=True)
+            raise RuntimeError(f"xhtml2pdf reported {result.err} error(s)")
+
+    @staticmethod
+    def _inline_local_file(uri: str, rel: str) -> str:
+        # Newer xhtml2pdf releases refuse local reads outside the working directory,
+        # so report images are handed over inline instead of as paths.
+        path = Path(uri)
+        if uri.startswith('data:') or not path.is_file():
+            return uri
+        mime_type = mimetypes.guess_type(path.name)[0] or 'application/octet-stream'
+        return f"data:{mime_type};base64,{base64.b64encode(path.read_bytes()).decode('ascii')}"
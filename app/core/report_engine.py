@@ -1,25 +1,86 @@
-import pandas as pd
+import csv
+import math
+import os
 from datetime import datetime
 from pathlib import Path
 import jinja2
-import pdfkit
+from markupsafe import Markup
 import uuid
 import logging
 import random
-from typing import List, Dict, Optional, Union
+import re
+import shutil
+import tempfile
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable, FrozenSet, Iterable, Iterator, List, Dict, Optional, Tuple, Union
+
+from app.core.batch_output import BatchOutput, open_batch_output
+from app.core.claim_sources import (
+    CLAIM_COLUMN, ClaimSources, DataFiles, ParsedFileCache, claim_key, resolve_data_files, worksheet_rows
+)
+from app.core.image_cache import ImageCache
+from app.core.journal import CheckpointJournal
+from app.core.manifest import RenderManifest, file_signatures, fingerprint
+from app.core.metrics import BatchMetrics
+from app.core.output_writers import OutputWriter, create_output_writer
+from app.core.photo_index import PhotoIndex, RoomClassifier, normalize_claim_number
+from app.core.preflight import PreflightReport, check_images, validate_claim
+from app.core.preview import html_outline
+from app.core.resource_bundle import ResourceBundle
+from app.core.template_cache import TemplateBytecodeCache
+from app.core.renderers import PdfRenderer, PdfkitRenderer, WkhtmltopdfBatchRenderer, Xhtml2pdfRenderer
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+REPORT_TEMPLATE = 'inspection_template.html'
+STATIC_PARTIALS = ('header', 'footer', 'signature')
+
+PDF_OPTIONS = {
+    'enable-local-file-access': '',
+    'margin-top': '3cm',
+    'margin-bottom': '2cm',
+    'encoding': 'UTF-8',
+    'quiet': '',
+    'header-spacing': '5',
+    'footer-spacing': '5',
+    'disable-smart-shrinking': ''
+}
 
 class InspectionReportEngine:
-    def __init__(self, config: dict):
+    def __init__(self, config: dict, renderer: Optional[PdfRenderer] = None,
+                 output_writer: Optional[OutputWriter] = None):
         self.config = config
         self.logger = self._setup_logging()
-        self.pdf_config = self._configure_pdfkit()
+        self.renderer = renderer or self._configure_pdfkit()
+        self.output_writer = output_writer or create_output_writer(config.get('OUTPUT_WRITER', {}))
         self.template_env = jinja2.Environment(
             loader=jinja2.FileSystemLoader(config['TEMPLATES_DIR']),
             autoescape=True,
             trim_blocks=True,
-            lstrip_blocks=True
+            lstrip_blocks=True,
+            bytecode_cache=self._configure_bytecode_cache()
         )
+        self._prune_bytecode_cache()
         self._register_template_filters()
+        self._photo_indexes: Dict[str, PhotoIndex] = {}
+        self._photo_index_lock = threading.Lock()
+        self._photo_index_key_locks: Dict[str, threading.Lock] = {}
+        self._claim_folder_keys = set()
+        self._claim_numbers_cache: Optional[Tuple[Tuple, FrozenSet[str]]] = None
+        self.room_classifier = RoomClassifier.from_config(config.get('ROOM_RULES'))
+        self.image_cache = self._configure_image_cache()
+        self.preview_cache = self._configure_preview_cache()
+        self.resource_bundle = self._configure_resource_bundle()
+        self.claim_cache = self._configure_claim_cache()
+        self._metrics: Optional[BatchMetrics] = None
+        self._untimed = threading.local()
+        self.last_batch_summary: Optional[Dict] = None
 
     def _setup_logging(self):
         logger = logging.getLogger(__name__)
@@ -30,24 +91,105 @@ class InspectionReportEngine:
         logger.addHandler(handler)
         return logger
 
-    def _configure_pdfkit(self):
-        try:
-            possible_paths = [
-                r'C:\Program Files\wkhtmltopdf\bin\wkhtmltopdf.exe',
-                '/usr/local/bin/wkhtmltopdf',
-                '/usr/bin/wkhtmltopdf'
-            ]
-            for path in possible_paths:
-                if Path(path).exists():
-                    return pdfkit.configuration(wkhtmltopdf=path)
-            return pdfkit.configuration()
+    def _configure_pdfkit(self) -> PdfRenderer:
+        backend = self.config.get('PDF_BACKEND', 'auto')
+        deterministic = self.config.get('DETERMINISTIC_REPORTS', False)
+        if backend == 'xhtml2pdf':
+            return Xhtml2pdfRenderer(deterministic=deterministic)
+        if backend not in ('auto', 'pdfkit', 'wkhtmltopdf-batch'):
+            raise ValueError(f"Unknown PDF backend: {backend}")
+        try:
+            wkhtmltopdf = self._find_wkhtmltopdf()
+            if backend == 'wkhtmltopdf-batch':
+                return WkhtmltopdfBatchRenderer(wkhtmltopdf, PDF_OPTIONS,
+                                                batch_size=self.config.get('PDF_BATCH_SIZE', 8),
+                                                deterministic=deterministic)
+            return PdfkitRenderer(wkhtmltopdf, PDF_OPTIONS, deterministic=deterministic)
         except Exception as e:
+            if backend == 'auto' and Xhtml2pdfRenderer.available():
+                self.logger.warning(f"wkhtmltopdf unavailable ({e}); using the xhtml2pdf renderer")
+                return Xhtml2pdfRenderer(deterministic=deterministic)
             self.logger.error(f"PDFKit configuration failed: {e}")
             raise RuntimeError("Could not configure PDF generator. Please install wkhtmltopdf.")
 
+    def _find_wkhtmltopdf(self) -> str:
+        possible_paths = [
+            r'C:\Program Files\wkhtmltopdf\bin\wkhtmltopdf.exe',
+            '/usr/local/bin/wkhtmltopdf',
+            '/usr/bin/wkhtmltopdf'
+        ]
+        for path in possible_paths:
+            if Path(path).exists():
+                return path
+        found = shutil.which('wkhtmltopdf')
+        if found is None:
+            raise OSError("No wkhtmltopdf executable found")
+        return found
+
+    def _configure_bytecode_cache(self) -> Optional[TemplateBytecodeCache]:
+        cache_dir = self.config.get('TEMPLATE_CACHE_DIR')
+        if not cache_dir:
+            return None
+        try:
+            Path(cache_dir).mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            self.logger.warning(f"Template cache disabled, cannot create {cache_dir}: {e}")
+            return None
+        return TemplateBytecodeCache(cache_dir)
+
+    def _prune_bytecode_cache(self):
+        cache = self.template_env.bytecode_cache
+        if cache is None:
+            return
+        try:
+            removed = cache.prune(self.template_env.list_templates())
+        except OSError as e:
+            self.logger.warning(f"Could not prune template cache: {e}")
+            return
+        if removed:
+            self.logger.info(f"Removed {removed} stale compiled templates")
+
+    def _configure_image_cache(self) -> Optional[ImageCache]:
+        settings = self.config.get('IMAGE_OPTIMIZATION', {})
+        if not settings.get('enabled', False):
+            return None
+        if not ImageCache.available():
+            self.logger.warning("Pillow is not installed; embedding original photos without resizing")
+            return None
+        return ImageCache(
+            settings['cache_dir'],
+            dpi=settings.get('dpi', 150),
+            quality=settings.get('quality', 80)
+        )
+
+    def _configure_preview_cache(self) -> Optional[ImageCache]:
+        settings = self.config.get('PREVIEW', {})
+        if not settings.get('cache_dir') or not ImageCache.available():
+            return None
+        return ImageCache(
+            settings['cache_dir'],
+            dpi=settings.get('dpi', 48),
+            quality=settings.get('quality', 60)
+        )
+
+    def _configure_resource_bundle(self) -> Optional[ResourceBundle]:
+        settings = self.config.get('RESOURCE_BUNDLE', {})
+        if not settings.get('enabled', False):
+            return None
+        return ResourceBundle(int(settings.get('max_mb', 256) * 1024 * 1024))
+
+    def _configure_claim_cache(self) -> Optional[ParsedFileCache]:
+        settings = self.config.get('INGEST', {})
+        if not settings.get('cache', False):
+            return None
+        if not ParsedFileCache.available():
+            self.logger.warning("pyarrow is not installed; claim files will be parsed on every run")
+            return None
+        return ParsedFileCache(settings['cache_dir'], settings.get('cache_format', 'parquet'))
+
     def _register_template_filters(self):
         def format_date(value, fmt='%B %d, %Y'):
-            if pd.isna(value):
+            if value is None or (isinstance(value, float) and math.isnan(value)):
                 return "N/A"
             try:
                 return datetime.strptime(str(value), '%Y-%m-%d').strftime(fmt)
@@ -55,38 +197,508 @@ class InspectionReportEngine:
                 return str(value)
         self.template_env.filters['format_date'] = format_date
 
-    def process_claims(self, data_file: Union[str, Path], output_dir: Union[str, Path], 
-                      photos_dir: Optional[Union[str, Path]] = None) -> List[Path]:
+    def process_claims(self, data_file: DataFiles, output_dir: Union[str, Path], 
+                      photos_dir: Optional[Union[str, Path]] = None,
+                      workers: Optional[int] = None,
+                      incremental: Optional[bool] = None,
+                      progress_callback: Optional[Callable[[Dict], None]] = None,
+                      cancel_event: Optional[threading.Event] = None) -> List[Path]:
+        manifest = None
+        journal = None
+        combined = None
+        render_dir = None
+        metrics = self._metrics = BatchMetrics()
+        output_dir = Path(output_dir)
         try:
-            claims = self._load_data(data_file)
-            reports_generated = []
-            output_dir = Path(output_dir)
+            sources = self._claim_sources(data_file)
+            claims = metrics.timed_iter(self._iter_claims(sources), 'load_data')
+            self._refresh_photo_indexes()
             output_dir.mkdir(parents=True, exist_ok=True)
+            workers = max(1, int(workers or self.config.get('RENDER_WORKERS', 1)))
+            if incremental is None:
+                incremental = self.config.get('INCREMENTAL', False)
+            combined = self._open_batch_output(output_dir)
+            if combined is not None:
+                # Per-claim PDFs only live in a local scratch directory until they are added to the batch file.
+                render_dir = Path(tempfile.mkdtemp(prefix='inspectionpro-batch-'))
+                if incremental:
+                    self.logger.warning("Incremental mode is not available with combined batch output")
+                    incremental = False
+            if incremental:
+                manifest = RenderManifest(output_dir)
+            if self.config.get('RESUME_BATCHES', True) and combined is None:
+                journal = CheckpointJournal(output_dir)
+                if len(journal):
+                    self.logger.info(f"Resuming interrupted batch: {len(journal)} claims already completed")
+
+            batch = {
+                'output_dir': render_dir or output_dir,
+                'photos_dir': photos_dir,
+                'claim_numbers': self._batch_claim_numbers(sources, photos_dir),
+                'manifest': manifest,
+                'journal': journal,
+                # The combined file is already written atomically, so its parts skip the writer.
+                'writer': OutputWriter(render_dir) if combined is not None else self.output_writer,
+                'failed_outputs': set(),
+                'batch_fingerprint': self._batch_fingerprint() if manifest is not None or journal is not None else None,
+                'template': self.template_env.get_template(REPORT_TEMPLATE),
+                'static_sections': {},
+                'metrics': metrics,
+                'progress_callback': progress_callback,
+                'cancel_event': cancel_event
+            }
+            if progress_callback is not None:
+                self._notify(batch, {'event': 'batch', 'total': self._count_claims(sources)})
+
+            def process(chunk):
+                return self._process_chunk(chunk, batch)
+
+            chunks = self._until_cancelled(self._chunked(enumerate(claims, 1), self.renderer.batch_size), batch)
+            if workers > 1:
+                self.logger.info(f"Rendering claims with {workers} workers")
+                results = self._map_in_order(process, chunks, workers)
+            else:
+                results = (process(chunk) for chunk in chunks)
+            report_paths = (report_path for chunk in results for report_path in chunk if report_path is not None)
+            if combined is None:
+                reports = list(report_paths)
+                self.output_writer.flush()
+                reports = [report_path for report_path in reports if report_path not in batch['failed_outputs']]
+            else:
+                reports = self._write_batch_output(combined, report_paths, metrics)
+            # Only an interrupted batch is resumed; rows that failed in a finished one are rendered again next run.
+            if journal is not None and not self._cancelled(batch):
+                journal.discard()
+            return reports
+        except Exception as e:
+            self.logger.error(f"Fatal error processing claims: {e}")
+            if combined is not None:
+                combined.abort()
+            raise
+        finally:
+            if manifest is not None:
+                manifest.save()
+            self.output_writer.flush()
+            if journal is not None:
+                journal.close()
+            if render_dir is not None:
+                shutil.rmtree(render_dir, ignore_errors=True)
+            self._finish_metrics(metrics, output_dir)
+
+    def _open_batch_output(self, output_dir: Path) -> Optional[BatchOutput]:
+        settings = self.config.get('BATCH_OUTPUT', {})
+        filename = datetime.now().strftime(settings.get('filename', 'INSPECTION REPORTS - %Y-%m-%d %H%M%S'))
+        return open_batch_output(settings.get('mode', 'separate'), output_dir, filename,
+                                 merge_slice=settings.get('merge_slice', 100))
+
+    def _write_batch_output(self, combined: BatchOutput, report_paths: Iterator[Path],
+                            metrics: BatchMetrics) -> List[Path]:
+        for report_path in report_paths:
+            with metrics.stage('combine_output'):
+                combined.add(report_path, report_path.stem.replace('FIRST INSPECTION REPORT - ', ''))
+            report_path.unlink(missing_ok=True)
+        with metrics.stage('combine_output'):
+            output_path = combined.close()
+        if output_path is None:
+            return []
+        metrics.combined_output = {'path': str(output_path), 'bytes': output_path.stat().st_size,
+                                   'reports': combined.count}
+        self.logger.info(f"Wrote {combined.count} reports to {output_path.name}")
+        return [output_path]
+
+    def preflight(self, data_file: DataFiles, output_dir: Optional[Union[str, Path]] = None,
+                  photos_dir: Optional[Union[str, Path]] = None) -> Dict:
+        # A check can still be running when a batch starts; it must not add to that batch's stage timings.
+        self._untimed.active = True
+        try:
+            return self._preflight(data_file, output_dir, photos_dir)
+        finally:
+            self._untimed.active = False
+
+    def _preflight(self, data_file: DataFiles, output_dir: Optional[Union[str, Path]],
+                   photos_dir: Optional[Union[str, Path]]) -> Dict:
+        settings = self.config.get('PREFLIGHT', {})
+        report = PreflightReport()
+        # Only changed folders are rescanned, so indexes a running batch uses are left in place.
+        self._refresh_photo_indexes(check_mtime=True)
+
+        if output_dir is not None:
+            output_path = Path(output_dir)
+            if output_path.exists() and not output_path.is_dir():
+                report.error(None, None, f"Output path is not a directory: {output_path}")
+            elif output_path.exists() and not os.access(output_path, os.W_OK):
+                report.error(None, None, f"Output directory is not writable: {output_path}")
+
+        outputs: Dict[str, int] = {}
+        image_rows: Dict[str, List[Tuple[int, object]]] = {}
+        min_sizes: Dict[str, Tuple[int, int]] = {}
+        photo_min_size = tuple(settings.get('min_image_px', (200, 150)))
+        try:
+            sources = self._claim_sources(data_file)
+            claim_numbers = self._batch_claim_numbers(sources, photos_dir)
+            for idx, claim in enumerate(self._iter_claims(sources), 1):
+                report.claims += 1
+                claim_number = claim.get('CLAIM #')
+                problems = validate_claim(claim)
+                for problem in problems:
+                    report.error(idx, claim_number, problem)
+                if problems:
+                    continue
+
+                claim_data = self._prepare_claim_data(claim, photos_dir, claim_numbers)
+                name = self._report_path(claim_data, Path(output_dir or '.')).name
+                if name in outputs:
+                    report.error(idx, claim_number, f"Output file already used by row {outputs[name]}: {name}")
+                else:
+                    outputs[name] = idx
+
+                if photos_dir and not claim_data['photos']:
+                    report.warning(idx, claim_number, "No room photos found")
+                # Banners are wide and short by design, so only photos get the resolution check.
+                for image in filter(None, [claim_data.get('header_image'), claim_data.get('footer_image')]):
+                    min_sizes.setdefault(image, (0, 0))
+                    image_rows.setdefault(image, []).append((idx, claim_number))
+                photos = [claim_data.get('front_photo')]
+                photos.extend(image for room in claim_data['photos'] for image in room['images'])
+                for image in filter(None, photos):
+                    min_sizes[image] = photo_min_size
+                    image_rows.setdefault(image, []).append((idx, claim_number))
+            kept = 'first' if sources.keep == 'first' or not sources.combined else 'last'
+            for claim_number in sources.duplicate_claims:
+                report.warning(None, claim_number, f"Claim number appears in more than one row; only the {kept} is rendered")
+        except Exception as e:
+            report.error(None, None, str(e))
+
+        results = check_images(min_sizes, workers=settings.get('workers', 8))
+        report.images_checked = len(results)
+        for image, (error, warning) in results.items():
+            rows = image_rows[image]
+            suffix = f" (used by {len(rows)} claims)" if len(rows) > 1 else ""
+            idx, claim_number = rows[0]
+            if error:
+                report.error(idx, claim_number, error + suffix)
+            if warning:
+                report.warning(idx, claim_number, warning + suffix)
+
+        summary = report.to_dict()
+        self.logger.info(
+            f"Preflight checked {summary['claims']} claims and {summary['images_checked']} images: "
+            f"{len(summary['errors'])} errors, {len(summary['warnings'])} warnings"
+        )
+        return summary
+
+    def preview_claim(self, data_file: DataFiles, photos_dir: Optional[Union[str, Path]] = None,
+                      claim_number: Optional[str] = None,
+                      html_path: Optional[Union[str, Path]] = None) -> Dict:
+        """Render one claim to HTML only, with thumbnail images, to check a report without making a PDF.
+
+        ``claim_number`` selects the claim, the first one is used otherwise.
+        Images are low resolution copies from the preview cache referenced by
+        file URI, so the HTML (written to ``html_path`` when given) opens in
+        any browser. Photo folders are only rescanned when they changed.
+        """
+        started = last = time.perf_counter()
+        timings = {}
+
+        def mark(name):
+            nonlocal last
+            now = time.perf_counter()
+            timings[name] = round(now - last, 4)
+            last = now
+
+        sources = self._claim_sources(data_file)
+        row, claim = self._find_claim(sources, claim_number)
+        mark('load_claim')
+        self._refresh_photo_indexes(check_mtime=True)
+        claim_data = self._prepare_claim_data(claim, photos_dir, self._batch_claim_numbers(sources, photos_dir))
+        mark('photos')
+        thumbnails = self._map_images(claim_data, self._thumbnail)
+        mark('thumbnails')
+        page = self._map_images(thumbnails, lambda path, size_in: Path(path).resolve().as_uri())
+        try:
+            html_content = self.template_env.get_template(REPORT_TEMPLATE).render(
+                claim=page,
+                config=self.config,
+                static=self._static_sections(page),
+                now=claim_data.get('rendered_at') or datetime.now().strftime('%Y-%m-%d %H:%M')
+            )
+        except jinja2.TemplateError as e:
+            raise ValueError(f"Template error: {e}")
+        mark('template_render')
+        if html_path is not None:
+            Path(html_path).write_text(html_content, encoding='utf-8')
+
+        return {
+            'row': row,
+            'claim': claim.get('CLAIM #'),
+            'insured': claim.get('INSURED/POLICYHOLDER'),
+            'address': claim.get('ADDRESS'),
+            'problems': validate_claim(claim),
+            'sections': html_outline(html_content),
+            'front_photo': thumbnails.get('front_photo'),
+            'photos': thumbnails['photos'],
+            'html': html_content,
+            'html_path': str(html_path) if html_path is not None else None,
+            'timings': timings,
+            'elapsed_seconds': round(time.perf_counter() - started, 3)
+        }
+
+    def _find_claim(self, data_file: Union[DataFiles, ClaimSources], claim_number: Optional[str]) -> Tuple[int, Dict]:
+        wanted = str(claim_number).strip().upper() if claim_number is not None else None
+        claims = self._iter_claims(data_file)
+        try:
+            # Stops reading at the match, so claims near the top of a large file preview quickly.
             for idx, claim in enumerate(claims, 1):
+                if wanted is None or str(claim.get('CLAIM #')).strip().upper() == wanted:
+                    return idx, claim
+        finally:
+            claims.close()
+        raise ValueError(f"Claim not found: {claim_number}")
+
+    def _thumbnail(self, path: str, size_in: Tuple[float, float]) -> str:
+        if self.preview_cache is None:
+            return path
+        try:
+            return self.preview_cache.get(path, size_in)
+        except Exception as e:
+            self.logger.warning(f"Could not create thumbnail for {path}: {e}")
+            return path
+
+    def _finish_metrics(self, metrics: BatchMetrics, output_dir: Path):
+        metrics.finish()
+        self._metrics = None
+        if self.resource_bundle is not None:
+            metrics.resource_bundle = self.resource_bundle.stats()
+        summary = self.last_batch_summary = metrics.summary()
+        self.logger.info(
+            f"Batch finished in {summary['elapsed_seconds']}s: {summary['generated']} generated, "
+            f"{summary['skipped']} skipped, {summary['failed']} failed, {summary['cancelled']} cancelled "
+            f"({summary['claims_per_minute']} claims/min)"
+        )
+        if output_dir.is_dir():
+            try:
+                metrics.write(output_dir)
+            except OSError as e:
+                self.logger.warning(f"Could not write batch metrics: {e}")
+
+    def _stage(self, name: str):
+        metrics = self._metrics
+        if metrics is None or getattr(self._untimed, 'active', False):
+            return nullcontext()
+        return metrics.stage(name)
+
+    def _batch_fingerprint(self) -> str:
+        template_sources = [
+            self.template_env.loader.get_source(self.template_env, name)[0]
+            for name in sorted(self.template_env.list_templates())
+        ]
+        return fingerprint(template_sources, self.config)
+
+    def _claim_fingerprint(self, claim: Dict, claim_data: Dict, batch: Dict) -> str:
+        photos = [claim_data.get('header_image'), claim_data.get('footer_image'), claim_data.get('front_photo')]
+        for room in claim_data.get('photos') or []:
+            photos.extend(room['images'])
+        return fingerprint(batch['batch_fingerprint'], claim, file_signatures(photos))
+
+    @staticmethod
+    def _chunked(items: Iterator, size: int) -> Iterator[List]:
+        items = iter(items)
+        while True:
+            chunk = list(islice(items, size))
+            if not chunk:
+                return
+            yield chunk
+
+    def _until_cancelled(self, chunks: Iterator[List], batch: Dict) -> Iterator[List]:
+        for chunk in chunks:
+            if self._cancelled(batch):
+                self.logger.info("Batch cancelled; no further claims will be started")
+                return
+            yield chunk
+
+    @staticmethod
+    def _cancelled(batch: Dict) -> bool:
+        cancel_event = batch.get('cancel_event')
+        return cancel_event is not None and cancel_event.is_set()
+
+    def _count_claims(self, sources: ClaimSources) -> Optional[int]:
+        try:
+            if sources.combined:
+                return len(sources.load())
+            file_path = sources.files[0]
+            if file_path.suffix.lower() == '.csv':
+                with open(file_path, encoding='utf-8-sig', newline='') as handle:
+                    return max(0, sum(1 for _ in csv.reader(handle)) - 1)
+            import openpyxl
+            workbook = openpyxl.load_workbook(file_path, read_only=True)
+            try:
+                return max(0, (workbook.worksheets[0].max_row or 1) - 1)
+            finally:
+                workbook.close()
+        except Exception:
+            return None
+
+    @staticmethod
+    def _map_in_order(func, items: Iterator, workers: int) -> Iterator:
+        # Keep a bounded window of claims in flight so a streamed file is never fully buffered.
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+            for item in items:
+                pending.append(executor.submit(func, item))
+                if len(pending) >= workers * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def _process_chunk(self, chunk: List[Tuple[int, Dict]], batch: Dict) -> List[Optional[Path]]:
+        results: List[Optional[Path]] = [None] * len(chunk)
+        manifest = batch['manifest']
+        journal = batch['journal']
+        metrics = batch['metrics']
+        records = [metrics.new_claim(idx) for idx, _ in chunk]
+        jobs = []
+        finals = []
+        positions = []
+        fingerprints = {}
+        published = set()
+        for pos, (idx, claim) in enumerate(chunk):
+            if self._cancelled(batch):
+                records[pos]['status'] = 'cancelled'
+                continue
+            with metrics.track(records[pos]):
                 try:
-                    claim_data = self._prepare_claim_data(claim, photos_dir)
-                    report_path = self._generate_report(claim_data, output_dir)
-                    reports_generated.append(report_path)
-                    self.logger.info(f"Generated report {idx}/{len(claims)}: {report_path.name}")
+                    with metrics.stage('prepare_claim_data'):
+                        claim_data = self._prepare_claim_data(claim, batch['photos_dir'], batch['claim_numbers'])
+                    records[pos]['images'] = self._count_images(claim_data)
+                    if manifest is not None or journal is not None:
+                        claim_fingerprint = fingerprints[pos] = self._claim_fingerprint(claim, claim_data, batch)
+                        current = journal.completed_output(claim_fingerprint) if journal is not None else None
+                        reason = "completed before the batch was interrupted"
+                        if current is not None and manifest is not None:
+                            manifest.record(current.name, claim_fingerprint, current)
+                        elif manifest is not None:
+                            report_path = self._report_path(claim_data, batch['output_dir'])
+                            current = manifest.current_output(report_path.name, claim_fingerprint)
+                            reason = "up to date"
+                        if current is not None:
+                            self.logger.info(f"Skipped report {idx} ({reason}): {current.name}")
+                            records[pos]['status'] = 'skipped'
+                            results[pos] = current
+                            continue
+                    html_content, report_path = self._build_report_job(claim_data, batch['output_dir'], batch)
+                    jobs.append((html_content, batch['writer'].scratch_path(report_path)))
+                    finals.append(report_path)
+                    positions.append(pos)
                 except Exception as e:
                     self.logger.error(f"Failed to process claim {idx}: {e}")
-                    continue
-            return reports_generated
+                    records[pos]['error'] = str(e)
+
+        if jobs and self._cancelled(batch):
+            for pos in positions:
+                records[pos]['status'] = 'cancelled'
+            jobs, positions = [], []
+
+        errors = []
+        if jobs:
+            started = time.perf_counter()
+            errors = self.renderer.render_batch(jobs)
+            per_claim = (time.perf_counter() - started) / len(jobs)
+            for pos in positions:
+                metrics.add_time('pdf_conversion', per_claim, records[pos])
+
+        for pos, (_, scratch_path), report_path, error in zip(positions, jobs, finals, errors):
+            idx = chunk[pos][0]
+            if error is not None:
+                batch['writer'].discard(scratch_path)
+                self.logger.error(f"Failed to process claim {idx}: Failed to generate PDF: {error}")
+                records[pos]['error'] = f"Failed to generate PDF: {error}"
+                continue
+            published.add(pos)
+            results[pos] = report_path
+            batch['writer'].publish(
+                scratch_path,
+                report_path,
+                lambda publish_error, pos=pos: self._finish_claim(chunk[pos][0], records[pos], results[pos],
+                                                                  fingerprints.get(pos), publish_error, batch)
+            )
+
+        for pos, (idx, _) in enumerate(chunk):
+            if pos not in published:
+                self._notify_claim(batch, idx, records[pos], results[pos])
+        return results
+
+    def _finish_claim(self, idx: int, record: Dict, report_path: Path, claim_fingerprint: Optional[str],
+                      error: Optional[Exception], batch: Dict):
+        # Called once the report is in place, possibly from a background publishing thread.
+        if error is not None:
+            self.logger.error(f"Failed to process claim {idx}: Failed to write report: {error}")
+            record['error'] = f"Failed to write report: {error}"
+            batch['failed_outputs'].add(report_path)
+            self._notify_claim(batch, idx, record, None)
+            return
+        self.logger.info(f"Generated report {idx}: {report_path.name}")
+        if batch['manifest'] is not None:
+            batch['manifest'].record(report_path.name, claim_fingerprint, report_path)
+        if batch['journal'] is not None:
+            try:
+                batch['journal'].record(claim_fingerprint, report_path)
+            except OSError as e:
+                self.logger.warning(f"Could not journal claim {idx}: {e}")
+        record['status'] = 'generated'
+        try:
+            record['bytes'] = report_path.stat().st_size
+        except OSError:
+            pass
+        self._notify_claim(batch, idx, record, report_path)
+
+    def _notify_claim(self, batch: Dict, idx: int, record: Dict, report_path: Optional[Path]):
+        self._notify(batch, {
+            'event': 'claim',
+            'index': idx,
+            'status': record['status'],
+            'output': str(report_path) if report_path else None,
+            'error': record.get('error')
+        })
+
+    def _notify(self, batch: Dict, event: Dict):
+        callback = batch.get('progress_callback')
+        if callback is None:
+            return
+        try:
+            callback(event)
         except Exception as e:
-            self.logger.error(f"Fatal error processing claims: {e}")
-            raise
+            self.logger.warning(f"Progress callback failed: {e}")
+
+    @staticmethod
+    def _count_images(claim_data: Dict) -> int:
+        count = 1 if claim_data.get('front_photo') else 0
+        return count + sum(len(room['images']) for room in claim_data.get('photos') or [])
 
-    def _prepare_claim_data(self, claim: Dict, photos_dir: Optional[Path]) -> Dict:
+    def _prepare_claim_data(self, claim: Dict, photos_dir: Optional[Path],
+                            claim_numbers: FrozenSet[str] = frozenset()) -> Dict:
         claim_data = claim.copy()
-        claim_data['report_id'] = f"FIR-{datetime.now().strftime('%Y%m%d')}-{uuid.uuid4().hex[:6].upper()}"
+        if self.config.get('DETERMINISTIC_REPORTS', False):
+            # Everything that would differ between runs is derived from the claim itself.
+            digest = fingerprint(claim)
+            report_date = self._report_date(claim)
+            rng = random.Random(digest)
+            claim_data['report_id'] = f"FIR-{report_date.strftime('%Y%m%d') if report_date else 'UNDATED'}-{digest[:6].upper()}"
+            claim_data['rendered_at'] = report_date.strftime('%Y-%m-%d %H:%M') if report_date else ''
+        else:
+            rng = random
+            claim_data['report_id'] = f"FIR-{datetime.now().strftime('%Y%m%d')}-{uuid.uuid4().hex[:6].upper()}"
 
         if photos_dir:
             photos_path = Path(photos_dir)
             if photos_path.exists():
-                claim_data['header_image'] = self._find_special_image(photos_path, 'header')
-                claim_data['footer_image'] = self._find_special_image(photos_path, 'footer')
-                claim_data['front_photo'] = self._find_special_image(photos_path, ['front', 'facade'])
-                claim_data['photos'] = self._organize_room_photos(photos_path, claim_data)
+                claim_path = self._claim_photos_path(photos_path, claim_data, claim_numbers)
+                # Branding images may live once in the shared root; everything else comes from the claim's folder.
+                claim_data['header_image'] = (self._find_special_image(claim_path, 'header', claim_numbers)
+                                              or self._find_special_image(photos_path, 'header', claim_numbers))
+                claim_data['footer_image'] = (self._find_special_image(claim_path, 'footer', claim_numbers)
+                                              or self._find_special_image(photos_path, 'footer', claim_numbers))
+                claim_data['front_photo'] = self._find_special_image(claim_path, ['front', 'facade'], claim_numbers)
+                claim_data['photos'] = self._organize_room_photos(claim_path, claim_data, claim_numbers)
             else:
                 self.logger.warning(f"Photos directory not found: {photos_path}")
                 claim_data.update({
@@ -103,9 +715,9 @@ class InspectionReportEngine:
                 'photos': []
             })
 
-        claim_data['indemnity_amount'] = f"{random.randint(20000, 30000):,}.00"
-        claim_data['expense_reserve'] = f"{random.randint(3000, 6000):,}.00"
-        claim_data['total_reserve'] = f"{random.randint(8000, 12000):,}.00"
+        claim_data['indemnity_amount'] = f"{rng.randint(20000, 30000):,}.00"
+        claim_data['expense_reserve'] = f"{rng.randint(3000, 6000):,}.00"
+        claim_data['total_reserve'] = f"{rng.randint(8000, 12000):,}.00"
 
         if 'SCOPE OF WORK' in claim_data:
             scope_items = [item.strip() for item in str(claim_data['SCOPE OF WORK']).split('\n') if item.strip()]
@@ -113,107 +725,367 @@ class InspectionReportEngine:
 
         return claim_data
 
-    def _find_special_image(self, photos_path: Path, keywords: Union[str, List[str]]) -> Optional[str]:
-        if isinstance(keywords, str):
-            keywords = [keywords]
-        for photo in photos_path.rglob('*.*'):
-            if photo.suffix.lower() not in ['.jpg', '.jpeg', '.png']:
+    @staticmethod
+    def _report_date(claim: Dict) -> Optional[datetime]:
+        value = claim.get('DATE OF REPORT')
+        if isinstance(value, datetime):
+            return value
+        for fmt in ('%B %d, %Y', '%Y-%m-%d', '%Y-%m-%d %H:%M:%S', '%d/%m/%Y'):
+            try:
+                return datetime.strptime(str(value).strip(), fmt)
+            except ValueError:
                 continue
-            lower_name = photo.name.lower()
-            if any(kw.lower() in lower_name for kw in keywords):
-                return str(photo)
         return None
 
-    def _organize_room_photos(self, photos_path: Path, claim: Dict) -> List[Dict]:
-        room_types = [
-            ('BEDROOM1', ['bedroom1', 'master']),
-            ('BEDROOM2', ['bedroom2', 'second']),
-            ('KITCHEN', ['kitchen']),
-            ('LIVING', ['living', 'lounge']),
-            ('STORAGE', ['storage', 'basement'])
-        ]
+    def _refresh_photo_indexes(self, check_mtime: Optional[bool] = None):
+        if check_mtime is None:
+            check_mtime = self.config.get('PHOTO_INDEX', {}).get('check_mtime', False)
+        with self._photo_index_lock:
+            if not check_mtime:
+                self._photo_indexes.clear()
+                self._claim_folder_keys.clear()
+                return
+            for key, index in list(self._photo_indexes.items()):
+                if index.is_stale():
+                    self.logger.info(f"Photos directory changed, rescanning: {index.root}")
+                    del self._photo_indexes[key]
 
-        photo_data = []
-        special_images = [
-            claim.get('header_image', ''),
-            claim.get('footer_image', ''),
-            claim.get('front_photo', '')
-        ]
+    def _get_photo_index(self, photos_path: Path, claim_numbers: FrozenSet[str] = frozenset()) -> PhotoIndex:
+        key = str(photos_path.resolve())
+        with self._photo_index_lock:
+            index = self._photo_indexes.get(key)
+            if index is not None and self._index_matches(index, claim_numbers):
+                return index
+            key_lock = self._photo_index_key_locks.setdefault(key, threading.Lock())
 
-        for room_name, keywords in room_types:
-            room_photos = []
-            for photo in photos_path.rglob('*.*'):
-                if photo.suffix.lower() not in ['.jpg', '.jpeg', '.png']:
-                    continue
-                if str(photo) in special_images:
-                    continue
-                photo_name = photo.name.lower()
-                photo_parent = photo.parent.name.lower()
-                if (any(kw in photo_name for kw in keywords) or 
-                    any(kw in photo_parent for kw in keywords)):
-                    room_photos.append(str(photo))
-            if room_photos:
-                photo_data.append({
-                    'room': room_name,
-                    'images': sorted(room_photos)[:4]
-                })
+        # Scan outside the shared lock so workers can index different claim folders at once.
+        with key_lock:
+            with self._photo_index_lock:
+                index = self._photo_indexes.get(key)
+                if index is not None and self._index_matches(index, claim_numbers):
+                    return index
+                pattern = None if key in self._claim_folder_keys else self._claim_folder_pattern()
+            index = PhotoIndex(photos_path, pattern, self.room_classifier, claim_numbers if pattern else None)
+            with self._photo_index_lock:
+                self._photo_indexes[key] = index
+                self._claim_folder_keys.update(str(path.resolve()) for path in index.claim_folders.values())
+        self.logger.info(f"Indexed {len(index.files)} photos in {photos_path}")
+        if index.claim_folders:
+            self.logger.info(f"Claim photo folders, used only for their own claim: "
+                             f"{self._folder_names(index.claim_folders.values())}")
+        if index.unclaimed_folders:
+            self.logger.info(f"Folders named like a claim number but not in this batch, kept with the shared photos: "
+                             f"{self._folder_names(index.unclaimed_folders)}")
+        return index
 
-        return photo_data
+    @staticmethod
+    def _index_matches(index: PhotoIndex, claim_numbers: FrozenSet[str]) -> bool:
+        # Which top-level folders belong to a claim depends on the claims in the batch.
+        return index.claim_folder_pattern is None or index.claim_numbers == claim_numbers
+
+    @staticmethod
+    def _folder_names(folders: Iterable[Path], limit: int = 10) -> str:
+        names = sorted(folder.name for folder in folders)
+        return ', '.join(names[:limit]) + (f" and {len(names) - limit} more" if len(names) > limit else '')
+
+    def _batch_claim_numbers(self, sources: ClaimSources, photos_dir: Optional[Union[str, Path]]) -> FrozenSet[str]:
+        """Normalized claim numbers of a batch; only their folders are treated as claim photo folders."""
+        pattern = self._claim_folder_pattern()
+        if not photos_dir or not pattern or not self._has_claim_folder_candidates(Path(photos_dir), pattern):
+            return frozenset()
+        signature = tuple((str(path), path.stat().st_mtime_ns, path.stat().st_size) for path in sources.files)
+        cached = self._claim_numbers_cache
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        claim_numbers = self.claim_numbers(sources)
+        self._claim_numbers_cache = (signature, claim_numbers)
+        return claim_numbers
+
+    def claim_numbers(self, data_file: Union[DataFiles, ClaimSources]) -> FrozenSet[str]:
+        """Normalized claim numbers in the claim data, the form photo folder names are matched in."""
+        return frozenset(filter(None, map(normalize_claim_number, self._iter_claim_column(data_file))))
+
+    def _iter_claim_column(self, data_file: Union[DataFiles, ClaimSources]) -> Iterator:
+        # Only the claim number column is read, a fraction of the cost of loading the claims.
+        sources = self._claim_sources(data_file)
+        if sources.combined:
+            # Parsed once; the batch streams its claims from the same frame.
+            frame = sources.load()
+            if CLAIM_COLUMN in frame.columns:
+                yield from frame[CLAIM_COLUMN]
+            return
+
+        file_path = sources.files[0]
+        chunksize = self.config.get('LOAD_CHUNK_SIZE', 500)
+        if file_path.suffix.lower() == '.csv':
+            try:
+                import pandas as pd
+            except ImportError:
+                for records in self._read_csv_batches(file_path, chunksize):
+                    yield from (record.get(CLAIM_COLUMN) for record in records)
+                return
+            try:
+                # Same chunks as the claim stream, so numbers are parsed to the same types.
+                for chunk in pd.read_csv(file_path, encoding='utf-8-sig', usecols=[CLAIM_COLUMN], chunksize=chunksize):
+                    yield from chunk[CLAIM_COLUMN]
+            except ValueError:
+                return  # No claim number column; loading the claims reports it
+            return
 
-    def _generate_report(self, claim: Dict, output_dir: Path) -> Path:
+        import openpyxl
+        workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
         try:
-            template = self.template_env.get_template('inspection_template.html')
-            html_content = template.render(
-                claim=claim,
-                config=self.config,
-                now=datetime.now().strftime('%Y-%m-%d %H:%M')
-            )
+            worksheet = workbook.worksheets[0]
+            header = next(worksheet.iter_rows(max_row=1, values_only=True), None)
+            if header is None or CLAIM_COLUMN not in header:
+                return
+            column = header.index(CLAIM_COLUMN) + 1
+            for (value,) in worksheet.iter_rows(min_row=2, min_col=column, max_col=column, values_only=True):
+                yield value
+        finally:
+            workbook.close()
 
-            output_path = output_dir / f"FIRST INSPECTION REPORT - CLAIM# {claim['CLAIM #']} - {claim['INSURED/POLICYHOLDER'].split()[0].upper()} - {claim['ADDRESS'].replace(',', '').replace(' ', '_')}.pdf"
-            
-            options = {
-                'enable-local-file-access': '',
-                'margin-top': '3cm',
-                'margin-bottom': '2cm',
-                'encoding': 'UTF-8',
-                'quiet': '',
-                'header-spacing': '5',
-                'footer-spacing': '5',
-                'disable-smart-shrinking': ''
-            }
+    def claim_folder_key(self, name: str) -> Optional[str]:
+        """Claim number a top-level photo folder is named after, or None when the name does not look like one."""
+        pattern = self._claim_folder_pattern()
+        match = re.match(pattern, name) if pattern else None
+        return normalize_claim_number(match.group(0)) if match else None
 
-            pdfkit.from_string(
-                html_content,
-                str(output_path),
-                configuration=self.pdf_config,
-                options=options
-            )
+    @staticmethod
+    def _has_claim_folder_candidates(photos_path: Path, pattern: str) -> bool:
+        regex = re.compile(pattern)
+        try:
+            with os.scandir(photos_path) as entries:
+                return any(entry.is_dir() and regex.match(entry.name) for entry in entries)
+        except OSError:
+            return False
+
+    def _claim_folder_pattern(self) -> Optional[str]:
+        settings = self.config.get('CLAIM_PHOTO_FOLDERS', {})
+        return settings.get('pattern') if settings.get('enabled', False) else None
+
+    def _claim_photos_path(self, photos_path: Path, claim: Dict, claim_numbers: FrozenSet[str] = frozenset()) -> Path:
+        claim_folder = self._get_photo_index(photos_path, claim_numbers).claim_folder(claim.get('CLAIM #'))
+        return claim_folder or photos_path
+
+    def _find_special_image(self, photos_path: Path, keywords: Union[str, List[str]],
+                            claim_numbers: FrozenSet[str] = frozenset()) -> Optional[str]:
+        with self._stage('find_special_image'):
+            return self._get_photo_index(photos_path, claim_numbers).find(keywords)
+
+    def _organize_room_photos(self, photos_path: Path, claim: Dict,
+                              claim_numbers: FrozenSet[str] = frozenset()) -> List[Dict]:
+        special_images = {
+            claim.get('header_image'),
+            claim.get('footer_image'),
+            claim.get('front_photo')
+        }
+        photo_data = []
+        with self._stage('organize_room_photos'):
+            for room in self._get_photo_index(photos_path, claim_numbers).room_photos():
+                images = [image for image in room['images'] if image not in special_images]
+                if images:
+                    photo_data.append({'room': room['room'], 'images': images})
+        return photo_data
+
+    def _optimize_images(self, claim: Dict) -> Dict:
+        if self.image_cache is None:
+            return claim
+
+        def optimized(path, size_in):
+            try:
+                return self.image_cache.get(path, size_in)
+            except Exception as e:
+                self.logger.warning(f"Could not optimize image {path}: {e}")
+                return path
+
+        return self._map_images(claim, optimized)
+
+    def _bundle_resources(self, claim: Dict) -> Dict:
+        if self.resource_bundle is None:
+            return claim
+
+        def embedded(path, size_in):
+            try:
+                return self.resource_bundle.data_uri(path)
+            except OSError as e:
+                self.logger.warning(f"Could not embed image {path}: {e}")
+                return path
+
+        return self._map_images(claim, embedded)
 
-            return output_path
+    def _map_images(self, claim: Dict, convert: Callable[[str, Tuple[float, float]], str]) -> Dict:
+        settings = self.config.get('IMAGE_OPTIMIZATION', {})
+        photo_size = tuple(settings.get('photo_size_in', (3.25, 2.25)))
+        banner_size = tuple(settings.get('banner_size_in', (8.27, 0.79)))
+
+        def mapped(path, size_in):
+            return convert(path, size_in) if path else path
+
+        claim = claim.copy()
+        claim['header_image'] = mapped(claim.get('header_image'), banner_size)
+        claim['footer_image'] = mapped(claim.get('footer_image'), banner_size)
+        claim['front_photo'] = mapped(claim.get('front_photo'), photo_size)
+        claim['photos'] = [
+            {'room': room['room'], 'images': [mapped(image, photo_size) for image in room['images']]}
+            for room in claim.get('photos') or []
+        ]
+        return claim
+
+    def _report_path(self, claim: Dict, output_dir: Path) -> Path:
+        return output_dir / f"FIRST INSPECTION REPORT - CLAIM# {claim['CLAIM #']} - {claim['INSURED/POLICYHOLDER'].split()[0].upper()} - {claim['ADDRESS'].replace(',', '').replace(' ', '_')}.pdf"
+
+    def _static_sections(self, claim: Dict, batch: Optional[Dict] = None) -> Dict[str, Markup]:
+        key = (claim.get('header_image'), claim.get('footer_image'))
+        cache = batch['static_sections'] if batch else {}
+        sections = cache.get(key)
+        if sections is None:
+            context = {'config': self.config, 'header_image': key[0], 'footer_image': key[1]}
+            sections = {
+                name: Markup(self.template_env.get_template(f'partials/{name}.html').render(**context))
+                for name in STATIC_PARTIALS
+            }
+            cache[key] = sections
+        return sections
+
+    def _build_report_job(self, claim: Dict, output_dir: Path, batch: Optional[Dict] = None) -> Tuple[str, Path]:
+        try:
+            with self._stage('optimize_images'):
+                claim = self._optimize_images(claim)
+            with self._stage('bundle_resources'):
+                claim = self._bundle_resources(claim)
+            template = batch['template'] if batch else self.template_env.get_template(REPORT_TEMPLATE)
+            with self._stage('template_render'):
+                html_content = template.render(
+                    claim=claim,
+                    config=self.config,
+                    static=self._static_sections(claim, batch),
+                    now=claim['rendered_at'] if 'rendered_at' in claim else datetime.now().strftime('%Y-%m-%d %H:%M')
+                )
+            return html_content, self._report_path(claim, output_dir)
         except jinja2.TemplateError as e:
             raise ValueError(f"Template error: {e}")
         except Exception as e:
             raise RuntimeError(f"Failed to generate PDF: {e}")
 
-    def _load_data(self, data_file: Union[str, Path]) -> List[Dict]:
-        file_path = Path(data_file)
-
-        if not file_path.exists():
-            raise FileNotFoundError(f"Input file not found: {file_path}")
+    def _load_data(self, data_file: DataFiles) -> List[Dict]:
+        return list(self._iter_claims(data_file))
 
-        try:
-            if file_path.suffix.lower() == '.csv':
-                df = pd.read_csv(file_path, encoding='utf-8-sig')
-            else:
-                df = pd.read_excel(file_path, engine='openpyxl')
+    def _claim_sources(self, data_file: Union[DataFiles, ClaimSources]) -> ClaimSources:
+        if isinstance(data_file, ClaimSources):
+            return data_file
+        settings = self.config.get('INGEST', {})
+        return ClaimSources(
+            resolve_data_files(data_file),
+            all_sheets=settings.get('all_sheets', True),
+            keep=settings.get('duplicates', 'last'),
+            workers=settings.get('workers', 4),
+            cache=self.claim_cache,
+            logger=self.logger
+        )
 
-            if df.empty:
-                raise ValueError("Input file contains no data")
+    def _iter_claims(self, data_file: Union[DataFiles, ClaimSources], chunksize: Optional[int] = None) -> Iterator[Dict]:
+        sources = self._claim_sources(data_file)
+        chunksize = chunksize or self.config.get('LOAD_CHUNK_SIZE', 500)
+        if sources.combined:
+            frame = sources.load()
+            chunks = (frame.iloc[start:start + chunksize] for start in range(0, len(frame), chunksize))
+            return self._stream_records(self._normalize_blanks(chunk).to_dict('records') for chunk in chunks)
 
-            df = df.replace({pd.NA: None, "": None})
-            df = df.applymap(lambda x: None if isinstance(x, str) and x.strip() == "" else x)
+        file_path = sources.files[0]
+        if file_path.suffix.lower() == '.csv':
+            try:
+                import pandas as pd
+            except ImportError:
+                return self._skip_repeated_claims(self._stream_records(self._read_csv_batches(file_path, chunksize)), sources)
+            try:
+                chunks = pd.read_csv(file_path, encoding='utf-8-sig', chunksize=chunksize)
+            except Exception as e:
+                raise ValueError(f"Failed to load data file: {e}")
+        else:
+            chunks = self._read_excel_chunks(file_path, chunksize)
+        return self._skip_repeated_claims(
+            self._stream_records(self._normalize_blanks(chunk).to_dict('records') for chunk in chunks), sources
+        )
 
-            return df.to_dict('records')
+    def _skip_repeated_claims(self, claims: Iterator[Dict], sources: ClaimSources) -> Iterator[Dict]:
+        # A streamed file cannot look ahead, so the first row of a repeated claim number is kept.
+        seen = set()
+        repeated = set()
+        sources.duplicates = 0
+        for claim in claims:
+            key = claim_key(claim.get(CLAIM_COLUMN))
+            if key is not None:
+                if key in seen:
+                    sources.duplicates += 1
+                    repeated.add(key)
+                    continue
+                seen.add(key)
+            yield claim
+        sources.duplicate_claims = sorted(repeated)
+        if sources.duplicates:
+            self.logger.info(f"Skipped {sources.duplicates} rows repeating an earlier claim number"
+                             + (" (a single file keeps the first row)" if sources.keep == 'last' else ""))
 
+    def _stream_records(self, batches: Iterator[List[Dict]]) -> Iterator[Dict]:
+        has_data = False
+        try:
+            for records in batches:
+                if not records:
+                    continue
+                has_data = True
+                yield from records
         except Exception as e:
             raise ValueError(f"Failed to load data file: {e}")
+        if not has_data:
+            raise ValueError("Failed to load data file: Input file contains no data")
+
+    @staticmethod
+    def _read_csv_batches(file_path: Path, chunksize: int) -> Iterator[List[Dict]]:
+        # Used when pandas is not installed, e.g. on headless render servers. Values stay strings.
+        with open(file_path, encoding='utf-8-sig', newline='') as handle:
+            batch = []
+            for row in csv.DictReader(handle):
+                batch.append({
+                    key: None if value is None or value.strip() == '' else value
+                    for key, value in row.items()
+                })
+                if len(batch) >= chunksize:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+
+    def _read_excel_chunks(self, file_path: Path, chunksize: int) -> Iterator['pd.DataFrame']:
+        import openpyxl
+        import pandas as pd
+
+        workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            columns, rows = worksheet_rows(workbook.worksheets[0])
+            if columns is None:
+                return
+            batch = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= chunksize:
+                    yield pd.DataFrame(batch, columns=columns)
+                    batch = []
+            if batch:
+                yield pd.DataFrame(batch, columns=columns)
+        finally:
+            workbook.close()
+
+    @staticmethod
+    def _normalize_blanks(df: 'pd.DataFrame') -> 'pd.DataFrame':
+        from pandas.api.types import infer_dtype
+
+        blank = df.isna()
+        for column in df.select_dtypes(include='object').columns:
+            values = df[column]
+            if infer_dtype(values, skipna=True) == 'string':
+                blank[column] |= values.str.strip().eq('')
+            else:
+                # Object columns also hold bools, Decimals, times or a mix; only text can be blank.
+                blank[column] |= values.map(lambda value: isinstance(value, str) and not value.strip()).astype(bool)
+        return df.astype(object).where(~blank, None)
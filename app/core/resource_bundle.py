@@ -0,0 +1,62 @@
+import base64
+import mimetypes
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+
+class ResourceBundle:
+    """Images encoded as data URIs, kept in a least-recently-used cache bounded by size.
+
+    Each distinct file is read and encoded once, then handed to every report
+    that uses it straight from memory. Entries are keyed on path, mtime and
+    size, so a replaced file is read again. Files larger than the whole
+    budget are encoded but not kept.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: 'OrderedDict[Tuple, str]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def data_uri(self, path: str) -> str:
+        stat = os.stat(path)
+        key = (path, stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            uri = self._entries.get(key)
+            if uri is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return uri
+            self.misses += 1
+
+        with open(path, 'rb') as handle:
+            data = handle.read()
+        mime_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        uri = f"data:{mime_type};base64,{base64.b64encode(data).decode('ascii')}"
+
+        if len(uri) <= self.max_bytes:
+            with self._lock:
+                if key not in self._entries:
+                    self._entries[key] = uri
+                    self.size += len(uri)
+                    while self.size > self.max_bytes:
+                        _, evicted = self._entries.popitem(last=False)
+                        self.size -= len(evicted)
+                        self.evictions += 1
+        return uri
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self.size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
@@ -0,0 +1,32 @@
+import fnmatch
+import os
+from hashlib import sha1
+from typing import Iterable, Optional
+
+import jinja2
+
+
+class TemplateBytecodeCache(jinja2.FileSystemBytecodeCache):
+    """Compiled template cache keyed on the template name alone.
+
+    Jinja's default key includes the absolute template filename. The onefile
+    EXE unpacks the templates into a new temporary folder on every launch, so
+    that key never matched twice. Stale bytecode is still detected, because
+    each bucket stores a checksum of the template source.
+    """
+
+    def get_cache_key(self, name: str, filename: Optional[str] = None) -> str:
+        return sha1(name.encode('utf-8')).hexdigest()
+
+    def prune(self, names: Iterable[str]) -> int:
+        """Delete cache files that belong to none of ``names``, e.g. those keyed by older template paths."""
+        keep = {self.pattern % (self.get_cache_key(name),) for name in names}
+        removed = 0
+        for filename in fnmatch.filter(os.listdir(self.directory), self.pattern % ('*',)):
+            if filename not in keep:
+                try:
+                    os.remove(os.path.join(self.directory, filename))
+                    removed += 1
+                except OSError:
+                    pass
+        return removed
@@ -0,0 +1,243 @@
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple, Union
+
+DATA_SUFFIXES = ('.xlsx', '.csv')
+
+
+class InboxWatcher:
+    """Renders claim spreadsheets dropped into an inbox directory.
+
+    The inbox and photos directory are polled, so only local directories
+    are needed. A spreadsheet is picked up once its size and modification
+    time, and the photo folders it uses, have stayed the same for
+    ``settle_seconds``, which skips uploads that are still being copied.
+    Every top-level folder of the photos directory settles on its own, and a
+    claim photo folder only holds back the spreadsheet with that claim, so
+    copying photos for one claim does not delay the others. Polls compare
+    directory modification times; files are only stat'ed in folders that
+    changed recently, so a photo overwritten in place under the same name is
+    not noticed. Settled changes re-submit the spreadsheets that use the
+    folder; with incremental rendering only the claims whose photos changed
+    are rendered again. Spreadsheets are handed to the engine
+    one at a time and each is rendered on the engine's bounded worker pool,
+    so its template environment and photo indexes stay warm between jobs.
+    """
+
+    def __init__(self, engine, inbox: Union[str, Path], output_dir: Union[str, Path],
+                 photos_dir: Optional[Union[str, Path]] = None,
+                 poll_seconds: float = 2.0, settle_seconds: float = 5.0,
+                 workers: Optional[int] = None,
+                 progress_callback: Optional[Callable[[Dict], None]] = None):
+        self.engine = engine
+        self.inbox = Path(inbox)
+        self.output_dir = Path(output_dir)
+        self.photos_dir = Path(photos_dir) if photos_dir else None
+        self.poll_seconds = poll_seconds
+        self.settle_seconds = settle_seconds
+        self.workers = workers
+        self.progress_callback = progress_callback
+        self.logger = engine.logger
+        self.stop_event = threading.Event()
+        self._observed: Dict[Path, Tuple[Tuple, float]] = {}
+        self._processed: Dict[Path, Tuple[Tuple, Dict[str, int]]] = {}
+        self._photo_folders: Dict[str, _PhotoFolder] = {}
+        self._claims: Dict[Path, Tuple[Tuple, FrozenSet[str]]] = {}
+
+    def run(self):
+        self.logger.info(f"Watching {self.inbox} for claim spreadsheets")
+        while not self.stop_event.is_set():
+            try:
+                self.poll_once()
+            except Exception as e:
+                self.logger.error(f"Watch poll failed: {e}")
+            self.stop_event.wait(self.poll_seconds)
+
+    def stop(self):
+        self.stop_event.set()
+
+    def poll_once(self, now: Optional[float] = None) -> List[Path]:
+        """Process every spreadsheet that is ready; returns the ones that were rendered."""
+        now = time.monotonic() if now is None else now
+        settled = self._scan_inbox(now)
+        self._scan_photos(now)
+        known = self._known_claims(settled)
+
+        processed = []
+        for path in sorted(settled):
+            if self.stop_event.is_set():
+                break
+            folders = self._folders_used(path, known)
+            if not all(self._photo_folders[name].settled for name in folders):
+                continue
+            versions = {name: self._photo_folders[name].version for name in folders}
+            previous = self._processed.get(path)
+            if previous is not None and previous[0] == self._observed[path][0]:
+                changed = [name for name in folders if previous[1].get(name) != versions[name]]
+                changed.extend(name for name in previous[1] if name not in self._photo_folders)
+                if not changed:
+                    continue
+                names = sorted(name or self.photos_dir.name for name in changed)
+                self.logger.info(f"Photos changed in {', '.join(names)}; re-checking {path.name}")
+            self._process(path, versions)
+            processed.append(path)
+        return processed
+
+    def _scan_inbox(self, now: float) -> List[Path]:
+        """Record the signature of every spreadsheet and return the ones that have settled."""
+        current = {}
+        try:
+            with os.scandir(self.inbox) as it:
+                for entry in it:
+                    # Skip Office lock files and hidden partial uploads.
+                    if entry.name.startswith(('~$', '.')) or not entry.is_file():
+                        continue
+                    if Path(entry.name).suffix.lower() in DATA_SUFFIXES:
+                        stat = entry.stat()
+                        current[Path(entry.path)] = (stat.st_size, stat.st_mtime_ns)
+        except OSError as e:
+            self.logger.warning(f"Cannot read inbox {self.inbox}: {e}")
+            return []
+
+        settled = []
+        observed = {}
+        for path, signature in current.items():
+            previous = self._observed.get(path)
+            changed_at = previous[1] if previous and previous[0] == signature else now
+            observed[path] = (signature, changed_at)
+            if now - changed_at >= self.settle_seconds:
+                settled.append(path)
+        self._observed = observed
+        for cache in (self._processed, self._claims):
+            for path in list(cache):
+                if path not in observed:
+                    del cache[path]
+        return settled
+
+    def _scan_photos(self, now: float):
+        """Update every top-level photo folder; the root's own files form the folder ``''``."""
+        if self.photos_dir is None:
+            return
+        names = ['']
+        try:
+            with os.scandir(self.photos_dir) as it:
+                names.extend(entry.name for entry in it if entry.is_dir())
+        except OSError as e:
+            self.logger.warning(f"Cannot read photos directory {self.photos_dir}: {e}")
+            return
+        folders = {}
+        for name in names:
+            folder = self._photo_folders.get(name) or _PhotoFolder()
+            # Files are only stat'ed while a folder is unsettled, so a photo still being copied keeps it that way.
+            signature = self._folder_signature(name, with_files=not folder.settled)
+            if folder.settled and signature[0] != folder.directories:
+                signature = self._folder_signature(name, with_files=True)
+            folder.update(signature, now, self.settle_seconds)
+            folders[name] = folder
+        self._photo_folders = folders
+
+    def _folder_signature(self, name: str, with_files: bool) -> Tuple[Tuple, Optional[Tuple]]:
+        directories, files = [], []
+        pending = [self.photos_dir / name] if name else [self.photos_dir]
+        while pending:
+            directory = pending.pop()
+            try:
+                directories.append((str(directory), directory.stat().st_mtime_ns))
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        if entry.is_dir():
+                            # The root's sub-folders are folders of their own.
+                            if name:
+                                pending.append(Path(entry.path))
+                        elif with_files:
+                            stat = entry.stat()
+                            files.append((entry.path, stat.st_size, stat.st_mtime_ns))
+            except OSError:
+                continue
+        return tuple(sorted(directories)), tuple(sorted(files)) if with_files else None
+
+    def _known_claims(self, settled: List[Path]) -> FrozenSet[str]:
+        """Claim numbers of every settled spreadsheet, read once per version of the file."""
+        if not any(self.engine.claim_folder_key(name) for name in self._photo_folders if name):
+            return frozenset()
+        for path in settled:
+            signature = self._observed[path][0]
+            cached = self._claims.get(path)
+            if cached is None or cached[0] != signature:
+                try:
+                    claim_numbers = self.engine.claim_numbers(path)
+                except Exception as e:
+                    self.logger.warning(f"Cannot read claim numbers from {path.name}: {e}")
+                    claim_numbers = frozenset()
+                self._claims[path] = (signature, claim_numbers)
+        return frozenset().union(*(claims for _, claims in self._claims.values()))
+
+    def _folders_used(self, path: Path, known: FrozenSet[str]) -> List[str]:
+        """Photo folders a spreadsheet depends on: all but the claim folders of other spreadsheets."""
+        claims = self._claims.get(path, ((), frozenset()))[1]
+        folders = []
+        for name in self._photo_folders:
+            key = self.engine.claim_folder_key(name) if name else None
+            if key is None or key in claims or key not in known:
+                folders.append(name)
+        return folders
+
+    def _process(self, path: Path, photo_versions: Dict[str, int]):
+        signature = self._observed[path][0]
+        self._notify({'event': 'job', 'input': str(path), 'status': 'started'})
+        try:
+            reports = self.engine.process_claims(
+                path,
+                self.output_dir,
+                self.photos_dir,
+                workers=self.workers,
+                incremental=True,
+                progress_callback=self.progress_callback,
+                cancel_event=self.stop_event
+            )
+        except Exception as e:
+            # Left alone until the file changes again, so a broken upload is not retried every poll.
+            self.logger.error(f"Failed to process {path.name}: {e}")
+            self._notify({'event': 'job', 'input': str(path), 'status': 'failed', 'error': str(e)})
+        else:
+            summary = self.engine.last_batch_summary or {}
+            self._notify({
+                'event': 'job',
+                'input': str(path),
+                'status': 'done',
+                'reports': len(reports),
+                'generated': summary.get('generated', 0),
+                'skipped': summary.get('skipped', 0),
+                'failed': summary.get('failed', 0)
+            })
+        self._processed[path] = (signature, photo_versions)
+
+    def _notify(self, event: Dict):
+        if self.progress_callback is None:
+            return
+        try:
+            self.progress_callback(event)
+        except Exception as e:
+            self.logger.warning(f"Progress callback failed: {e}")
+
+
+class _PhotoFolder:
+    """Change tracking for one top-level photo folder; ``version`` moves on with every change."""
+
+    def __init__(self):
+        self.directories: Optional[Tuple] = None
+        self.files: Optional[Tuple] = None
+        self.changed_at = 0.0
+        self.version = 0
+        self.settled = False
+
+    def update(self, signature: Tuple[Tuple, Optional[Tuple]], now: float, settle_seconds: float):
+        directories, files = signature
+        if directories != self.directories or (files is not None and files != self.files):
+            self.directories = directories
+            self.changed_at = now
+            self.version += 1
+        self.files = files
+        self.settled = now - self.changed_at >= settle_seconds
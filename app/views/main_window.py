@@ -1,11 +1,24 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 from pathlib import Path
+import os
+import queue
+import tempfile
 import threading
+import time
 import logging
+import webbrowser
 import sv_ttk  # For modern theme
 from typing import Optional, Dict
 
+try:
+    from PIL import Image, ImageTk
+except ImportError:  # Without Pillow the claim preview lists photos instead of showing thumbnails
+    Image = None
+    ImageTk = None
+
+from app.core.lazy_engine import LazyEngine
+
 class ReportGeneratorUI:
     def __init__(self, root, report_engine):
         """Initialize the report generator UI"""
@@ -24,6 +37,21 @@ class ReportGeneratorUI:
 
         
         self.progress_value = tk.IntVar(value=0)
+        self.events = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.cancel_btn = None
+        self.batch_progress = {}
+        self.preflight_results = queue.Queue()
+        self.preflight_generation = 0
+        self.preflight_pending = False
+        self.claim_preview_results = queue.Queue()
+        self.claim_preview_generation = 0
+        self.claim_preview_inputs = None
+        self.claim_preview_running = False
+        self.preview_input_results = queue.Queue()
+        self.preview_input_checking = False
+        self.preview_images: Dict[str, object] = {}
+        self.preview_html_path = Path(tempfile.gettempdir()) / f"inspectionpro-preview-{os.getpid()}.html"
 
     
         self.state = {
@@ -40,6 +68,8 @@ class ReportGeneratorUI:
         
         self.configure_tags()
         self.setup_bindings()
+        self.watch_engine_startup()
+        self.root.after(1000, self.watch_preview_inputs)
 
     def setup_ui(self):
         self.root.title("Inspection Pro - Report Generator")
@@ -95,14 +125,47 @@ class ReportGeneratorUI:
         preview_frame = ttk.LabelFrame(self.main_frame, text="Preview", padding=(15, 10))
         preview_frame.pack(fill=tk.BOTH, expand=True)
 
-        scrollbar = ttk.Scrollbar(preview_frame)
+        panes = ttk.PanedWindow(preview_frame, orient=tk.HORIZONTAL)
+        panes.pack(fill=tk.BOTH, expand=True)
+        summary_frame = ttk.Frame(panes)
+        claim_frame = ttk.Frame(panes)
+        panes.add(summary_frame, weight=1)
+        panes.add(claim_frame, weight=1)
+
+        scrollbar = ttk.Scrollbar(summary_frame)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
 
-        self.preview_text = tk.Text(preview_frame, wrap=tk.WORD, height=15, font=('Consolas', 10),
+        self.preview_text = tk.Text(summary_frame, wrap=tk.WORD, height=15, font=('Consolas', 10),
                                     yscrollcommand=scrollbar.set, padx=10, pady=10)
         self.preview_text.pack(fill=tk.BOTH, expand=True)
         scrollbar.config(command=self.preview_text.yview)
 
+        self.setup_claim_preview(claim_frame)
+
+    def setup_claim_preview(self, parent):
+        controls = ttk.Frame(parent)
+        controls.pack(fill=tk.X, padx=(10, 0), pady=(0, 5))
+
+        ttk.Label(controls, text="Claim #:").pack(side=tk.LEFT, padx=(0, 5))
+        self.claim_entry = ttk.Entry(controls, width=16)
+        self.claim_entry.pack(side=tk.LEFT, padx=(0, 5))
+        self.claim_entry.bind('<Return>', self.on_claim_entry_return)
+
+        ttk.Button(controls, text="Preview", command=self.schedule_claim_preview, width=10).pack(side=tk.LEFT)
+        self.open_preview_btn = ttk.Button(controls, text="Open in Browser", command=self.open_claim_preview,
+                                           state=tk.DISABLED)
+        self.open_preview_btn.pack(side=tk.RIGHT)
+
+        scrollbar = ttk.Scrollbar(parent)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.claim_preview_text = tk.Text(parent, wrap=tk.WORD, height=15, font=('Consolas', 10),
+                                          yscrollcommand=scrollbar.set, padx=10, pady=10)
+        self.claim_preview_text.pack(fill=tk.BOTH, expand=True, padx=(10, 0))
+        scrollbar.config(command=self.claim_preview_text.yview)
+        self.claim_preview_text.insert(tk.END, "The first claim is previewed here once a data file is selected.")
+        self.claim_preview_text.config(state=tk.DISABLED)
+
     def setup_action_buttons(self):
         button_frame = ttk.Frame(self.main_frame)
         button_frame.pack(fill=tk.X, pady=(15, 0))
@@ -114,6 +177,10 @@ class ReportGeneratorUI:
                                        style='Accent.TButton', state=tk.DISABLED)
         self.generate_btn.pack(side=tk.RIGHT)
 
+        self.cancel_btn = ttk.Button(button_frame, text="Cancel", command=self.cancel_report_generation,
+                                     state=tk.DISABLED, width=10)
+        self.cancel_btn.pack(side=tk.RIGHT, padx=(0, 10))
+
     def setup_status_bar(self):
         self.status_var = tk.StringVar()
         self.status_var.set("Ready")
@@ -143,11 +210,12 @@ class ReportGeneratorUI:
         self.preview_text.config(state=tk.DISABLED)
 
     def configure_tags(self):
-        self.preview_text.tag_config('bold', font=('Segoe UI', 9, 'bold'))
-        self.preview_text.tag_config('success', foreground='#2e7d32')
-        self.preview_text.tag_config('error', foreground='#c62828')
-        self.preview_text.tag_config('warning', foreground='#f9a825')
-        self.preview_text.tag_config('highlight', background='#e3f2fd')
+        for text in (self.preview_text, self.claim_preview_text):
+            text.tag_config('bold', font=('Segoe UI', 9, 'bold'))
+            text.tag_config('success', foreground='#2e7d32')
+            text.tag_config('error', foreground='#c62828')
+            text.tag_config('warning', foreground='#f9a825')
+            text.tag_config('highlight', background='#e3f2fd')
 
     def setup_bindings(self):
         self.root.protocol("WM_DELETE_WINDOW", self.on_close)
@@ -176,13 +244,14 @@ class ReportGeneratorUI:
         self.theme_btn.config(text="☀️" if self.state['theme'] == 'light' else "🌙")
 
     def browse_input_file(self):
-        file_path = filedialog.askopenfilename(title="Select Claim Data File",
-                                               filetypes=[("Excel Files", "*.xlsx *.xls"),
-                                                          ("CSV Files", "*.csv"),
-                                                          ("All Files", "*.*")])
-        if file_path:
-            self.state['input_file'] = file_path
-            self.update_entry(self.input_entry, file_path)
+        file_paths = filedialog.askopenfilenames(title="Select Claim Data Files",
+                                                 filetypes=[("Excel Files", "*.xlsx *.xls"),
+                                                            ("CSV Files", "*.csv"),
+                                                            ("All Files", "*.*")])
+        if file_paths:
+            # Several files are combined into one batch by the engine.
+            self.state['input_file'] = file_paths[0] if len(file_paths) == 1 else list(file_paths)
+            self.update_entry(self.input_entry, "; ".join(file_paths))
             self.update_preview()
 
     def browse_photos_dir(self):
@@ -209,8 +278,13 @@ class ReportGeneratorUI:
         self.preview_text.delete(1.0, tk.END)
 
         if self.state['input_file']:
-            self.preview_text.insert(tk.END, "📄 Input File:\n", 'bold')
-            self.preview_text.insert(tk.END, f"   {Path(self.state['input_file']).name}\n\n")
+            input_files = self.state['input_file']
+            if isinstance(input_files, str):
+                input_files = [input_files]
+            self.preview_text.insert(tk.END, "📄 Input Files:\n" if len(input_files) > 1 else "📄 Input File:\n", 'bold')
+            for input_file in input_files:
+                self.preview_text.insert(tk.END, f"   {Path(input_file).name}\n")
+            self.preview_text.insert(tk.END, "\n")
 
         if self.state['photos_dir']:
             self.preview_text.insert(tk.END, "📸 Photos Directory:\n", 'bold')
@@ -222,12 +296,267 @@ class ReportGeneratorUI:
             self.preview_text.insert(tk.END, "📁 Output Directory:\n", 'bold')
             self.preview_text.insert(tk.END, f"   {Path(self.state['output_dir']).name}\n\n")
 
+        if self.state['input_file']:
+            if self.state['processing']:
+                # Preflight would reset the photo indexes the running batch is using.
+                self.preflight_pending = True
+                self.preview_text.insert(tk.END, "🔎 Checking claims and photos after this batch...\n", 'highlight')
+            else:
+                self.preview_text.insert(tk.END, "🔎 Checking claims and photos...\n", 'highlight')
+                self.start_preflight()
+            self.schedule_claim_preview()
+
         self.update_generate_button()
         self.preview_text.config(state=tk.DISABLED)
 
+    def start_preflight(self):
+        self.preflight_generation += 1
+        thread = threading.Thread(
+            target=self.run_preflight,
+            args=(self.preflight_generation, self.state['input_file'], self.state['output_dir'], self.state['photos_dir']),
+            daemon=True
+        )
+        thread.start()
+        self.root.after(100, self.poll_preflight, self.preflight_generation)
+
+    def run_preflight(self, generation: int, input_file, output_dir, photos_dir):
+        # Runs on a worker thread: only talks to the UI through the result queue.
+        try:
+            report = self.engine.preflight(input_file, output_dir, photos_dir)
+        except Exception as e:
+            report = {'ok': False, 'claims': 0, 'images_checked': 0, 'warnings': [],
+                      'errors': [{'row': None, 'claim': None, 'message': str(e)}]}
+        self.preflight_results.put((generation, report))
+
+    def poll_preflight(self, generation: int):
+        # A newer selection supersedes results that are still in flight, and its own poll takes over.
+        if generation != self.preflight_generation:
+            return
+        try:
+            while True:
+                result_generation, report = self.preflight_results.get_nowait()
+                if result_generation == generation:
+                    self.show_preflight_report(report)
+                    return
+        except queue.Empty:
+            pass
+        self.root.after(100, self.poll_preflight, generation)
+
+    def show_preflight_report(self, report: Dict):
+        self.preview_text.config(state=tk.NORMAL)
+        start = self.preview_text.search("🔎 Checking claims and photos", 1.0, tk.END)
+        if start:
+            self.preview_text.delete(start, f"{start} lineend +1c")
+
+        self.preview_text.insert(tk.END, "🔎 Preflight:\n", 'bold')
+        self.preview_text.insert(
+            tk.END,
+            f"   {report['claims']} claims, {report['images_checked']} images checked\n"
+        )
+        if report['ok'] and not report['warnings']:
+            self.preview_text.insert(tk.END, "   ✅ No problems found\n", 'success')
+        for tag, problems in (('error', report['errors']), ('warning', report['warnings'])):
+            for problem in problems:
+                where = f"Row {problem['row']}" if problem['row'] else "Batch"
+                if problem['claim']:
+                    where += f" ({problem['claim']})"
+                self.preview_text.insert(tk.END, f"   {where}: {problem['message']}\n", tag)
+        self.preview_text.config(state=tk.DISABLED)
+        if not report['ok'] and not self.state['processing']:
+            self.status_var.set(f"Preflight found {len(report['errors'])} problems; those claims will fail")
+
+    def preview_inputs(self):
+        input_files = self.state['input_file']
+        input_files = (input_files,) if isinstance(input_files, str) else tuple(input_files or ())
+        return input_files, self.state['photos_dir'], self.engine.config['TEMPLATES_DIR']
+
+    @staticmethod
+    def preview_signature(inputs):
+        # Stat-only check of everything a preview depends on: data files, templates and photo folders.
+        # Photos may be on a network share, so this runs on worker threads, never on the Tk thread.
+        input_files, photos_dir, templates_dir = inputs
+        paths = list(input_files)
+        paths.extend(sorted(Path(templates_dir).rglob('*.html')))
+        if photos_dir:
+            photos_path = Path(photos_dir)
+            paths.append(photos_path)
+            try:
+                paths.extend(sorted(entry.path for entry in os.scandir(photos_path) if entry.is_dir()))
+            except OSError:
+                pass
+        signature = []
+        for path in paths:
+            try:
+                stat = os.stat(path)
+                signature.append((str(path), stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signature.append((str(path), None, None))
+        return inputs, tuple(signature)
+
+    def watch_preview_inputs(self):
+        try:
+            self.check_preview_inputs()
+        finally:
+            seconds = self.engine.config.get('PREVIEW', {}).get('refresh_seconds', 1.0) if self.engine_ready() else 1.0
+            self.root.after(int(seconds * 1000), self.watch_preview_inputs)
+
+    def check_preview_inputs(self):
+        try:
+            while True:
+                signature = self.preview_input_results.get_nowait()
+                self.preview_input_checking = False
+                # Results for an earlier selection, or while a preview is rendering, are left alone.
+                if (signature is not None and self.engine_ready() and not self.state['processing'] and not self.claim_preview_running
+                        and signature[0] == self.preview_inputs() and signature != self.claim_preview_inputs):
+                    self.schedule_claim_preview()
+        except queue.Empty:
+            pass
+        if (self.preview_input_checking or not self.state['input_file'] or not self.engine_ready()
+                or self.state['processing'] or self.claim_preview_running):
+            return
+        self.preview_input_checking = True
+        threading.Thread(target=self.run_preview_input_check, args=(self.preview_inputs(),), daemon=True).start()
+
+    def run_preview_input_check(self, inputs):
+        try:
+            signature = self.preview_signature(inputs)
+        except OSError as e:
+            self.logger.warning(f"Could not check preview inputs: {e}")
+            signature = None
+        self.preview_input_results.put(signature)
+
+    def schedule_claim_preview(self):
+        if not self.state['input_file'] or not self.engine_ready() or self.state['processing']:
+            return
+        self.claim_preview_running = True
+        self.claim_preview_generation += 1
+        thread = threading.Thread(
+            target=self.run_claim_preview,
+            args=(self.claim_preview_generation, self.preview_inputs(), self.claim_entry.get().strip() or None),
+            daemon=True
+        )
+        thread.start()
+        self.root.after(50, self.poll_claim_preview, self.claim_preview_generation)
+
+    def run_claim_preview(self, generation: int, inputs, claim_number):
+        # Runs on a worker thread: only talks to the UI through the result queue.
+        # The signature is taken first, so changes made while rendering trigger another preview.
+        signature = None
+        input_files, photos_dir, _ = inputs
+        try:
+            signature = self.preview_signature(inputs)
+            preview = self.engine.preview_claim(list(input_files), photos_dir, claim_number)
+        except Exception as e:
+            preview = {'error': str(e)}
+        self.claim_preview_results.put((generation, signature, preview))
+
+    def poll_claim_preview(self, generation: int):
+        # A newer selection or file change supersedes previews that are still rendering.
+        if generation != self.claim_preview_generation:
+            return
+        try:
+            while True:
+                result_generation, signature, preview = self.claim_preview_results.get_nowait()
+                if result_generation == generation:
+                    self.claim_preview_running = False
+                    self.claim_preview_inputs = signature
+                    self.show_claim_preview(preview)
+                    return
+        except queue.Empty:
+            pass
+        self.root.after(50, self.poll_claim_preview, generation)
+
+    def show_claim_preview(self, preview: Dict):
+        text = self.claim_preview_text
+        position = text.yview()[0]
+        text.config(state=tk.NORMAL)
+        text.delete(1.0, tk.END)
+        if len(self.preview_images) > 500:
+            self.preview_images.clear()
+        if 'error' in preview:
+            text.insert(tk.END, f"❌ {preview['error']}\n", 'error')
+            text.config(state=tk.DISABLED)
+            self.open_preview_btn.config(state=tk.DISABLED)
+            return
+
+        text.insert(tk.END, f"🧾 CLAIM# {preview['claim']}  (row {preview['row']})\n", 'bold')
+        text.insert(tk.END, f"   {preview['insured'] or ''}\n   {preview['address'] or ''}\n")
+        text.insert(tk.END, f"   Rendered in {preview['elapsed_seconds'] * 1000:.0f} ms\n\n")
+        for problem in preview['problems']:
+            text.insert(tk.END, f"   {problem}\n", 'error')
+
+        text.insert(tk.END, "📑 Sections:\n", 'bold')
+        for section in preview['sections']:
+            text.insert(tk.END, f"   {section}\n")
+
+        if preview['front_photo']:
+            text.insert(tk.END, "\n🏠 Front:\n", 'bold')
+            self.insert_thumbnail(text, preview['front_photo'])
+            text.insert(tk.END, "\n")
+        for room in preview['photos']:
+            text.insert(tk.END, f"\n📸 {room['room']} ({len(room['images'])}):\n", 'bold')
+            for image in room['images']:
+                self.insert_thumbnail(text, image)
+            text.insert(tk.END, "\n")
+        text.config(state=tk.DISABLED)
+        text.yview_moveto(position)
+        try:
+            self.preview_html_path.write_text(preview['html'], encoding='utf-8')
+            self.open_preview_btn.config(state=tk.NORMAL)
+        except OSError as e:
+            self.logger.warning(f"Could not write preview HTML: {e}")
+            self.open_preview_btn.config(state=tk.DISABLED)
+
+    def insert_thumbnail(self, text: tk.Text, path: str):
+        photo = self.preview_images.get(path)
+        if photo is None and ImageTk is not None:
+            try:
+                with Image.open(path) as image:
+                    image.thumbnail((160, 120))
+                    photo = ImageTk.PhotoImage(image)
+            except Exception as e:
+                self.logger.warning(f"Could not show thumbnail {path}: {e}")
+            else:
+                # Thumbnails are decoded once and kept, so a refresh only loads new photos.
+                self.preview_images[path] = photo
+        if photo is None:
+            text.insert(tk.END, f"   {Path(path).name}\n")
+        else:
+            text.image_create(tk.END, image=photo, padx=2, pady=2)
+
+    def on_claim_entry_return(self, event):
+        self.schedule_claim_preview()
+        # Stops the window-wide Return binding from starting a batch.
+        return 'break'
+
+    def open_claim_preview(self):
+        if self.preview_html_path.exists():
+            webbrowser.open(self.preview_html_path.as_uri())
+
+    def engine_ready(self) -> bool:
+        return not isinstance(self.engine, LazyEngine) or self.engine.ready
+
+    def watch_engine_startup(self):
+        # The engine loads on a background thread; never touch its attributes from here until it is ready.
+        if not isinstance(self.engine, LazyEngine):
+            return
+        if self.engine.error is not None:
+            self.generate_btn.config(state=tk.DISABLED)
+            self.status_var.set("Report engine failed to start")
+            messagebox.showerror("Error", f"Report engine failed to start:\n{self.engine.error}")
+            return
+        if not self.engine.ready:
+            self.status_var.set("Loading report engine...")
+            self.root.after(100, self.watch_engine_startup)
+            return
+        self.update_generate_button()
+
     def update_generate_button(self):
         if not hasattr(self, 'generate_btn') or self.generate_btn is None:
             return
+        if not self.engine_ready():
+            self.generate_btn.config(state=tk.DISABLED)
+            return
 
         if all([self.state['input_file'], self.state['output_dir']]):
             self.generate_btn.config(state=tk.NORMAL)
@@ -242,7 +571,7 @@ class ReportGeneratorUI:
             self.status_var.set(f"Please select {', '.join(missing)}")
 
     def start_report_generation(self):
-        if self.state['processing']:
+        if self.state['processing'] or not self.engine_ready():
             return
 
         if not messagebox.askyesno("Confirm Generation", "Generate inspection reports with current settings?"):
@@ -250,26 +579,100 @@ class ReportGeneratorUI:
 
         self.state['processing'] = True
         self.generate_btn.config(state=tk.DISABLED)
+        self.cancel_btn.config(state=tk.NORMAL)
         self.progress_value.set(0)
         self.status_var.set("Generating reports...")
         self.logger.info("Starting report generation")
 
-        thread = threading.Thread(target=self.generate_reports, daemon=True)
+        self.cancel_event = threading.Event()
+        self.events = queue.Queue()
+        self.batch_progress = {'total': None, 'done': 0, 'started': time.monotonic()}
+
+        thread = threading.Thread(target=self.generate_reports, args=(self.events, self.cancel_event), daemon=True)
         thread.start()
+        self.root.after(100, self.poll_events)
+
+    def cancel_report_generation(self):
+        if not self.state['processing']:
+            return
+        self.cancel_event.set()
+        self.cancel_btn.config(state=tk.DISABLED)
+        self.status_var.set("Cancelling after the claims in progress finish...")
 
-    def generate_reports(self):
+    def generate_reports(self, events: queue.Queue, cancel_event: threading.Event):
+        # Runs on a worker thread: only talks to the UI through the event queue.
         try:
-            reports = self.engine.process_claims(self.state['input_file'], self.state['output_dir'], self.state['photos_dir'])
-            self.progress_value.set(100)
-            self.show_success_message(len(reports))
-            self.logger.info(f"Successfully generated {len(reports)} reports")
+            reports = self.engine.process_claims(
+                self.state['input_file'],
+                self.state['output_dir'],
+                self.state['photos_dir'],
+                progress_callback=events.put,
+                cancel_event=cancel_event
+            )
+            summary = self.engine.last_batch_summary
+            # With combined batch output several claims share one file, so count claims rather than files.
+            count = summary['generated'] + summary['skipped'] if summary else len(reports)
+            events.put({'event': 'done', 'reports': count, 'summary': summary})
         except Exception as e:
-            self.show_error_message(str(e))
-            self.logger.error(f"Report generation failed: {str(e)}")
-        finally:
-            self.state['processing'] = False
-            if hasattr(self, 'generate_btn') and self.generate_btn:
-                self.generate_btn.config(state=tk.NORMAL)
+            events.put({'event': 'error', 'error': str(e)})
+
+    def poll_events(self):
+        finished = False
+        try:
+            while True:
+                event = self.events.get_nowait()
+                if event['event'] == 'batch':
+                    self.batch_progress['total'] = event['total']
+                elif event['event'] == 'claim':
+                    self.batch_progress['done'] += 1
+                    self.update_progress()
+                elif event['event'] in ('done', 'error'):
+                    finished = True
+                    self.finish_report_generation(event)
+        except queue.Empty:
+            pass
+        if not finished and self.state['processing']:
+            self.root.after(100, self.poll_events)
+
+    def update_progress(self):
+        done = self.batch_progress['done']
+        total = self.batch_progress['total']
+        elapsed = time.monotonic() - self.batch_progress['started']
+        rate = done / elapsed if elapsed > 0 else 0.0
+        if total:
+            self.progress_value.set(min(100, int(done * 100 / total)))
+            if rate:
+                remaining = int(max(0, total - done) / rate)
+                eta = f"ETA {remaining // 60:02d}:{remaining % 60:02d}"
+            else:
+                eta = "ETA --:--"
+            status = f"Processed {done}/{total} claims  •  {rate * 60:.1f} claims/min  •  {eta}"
+        else:
+            status = f"Processed {done} claims  •  {rate * 60:.1f} claims/min"
+        if self.cancel_event.is_set():
+            status = f"Cancelling...  •  {status}"
+        self.status_var.set(status)
+
+    def finish_report_generation(self, event: Dict):
+        self.state['processing'] = False
+        self.cancel_btn.config(state=tk.DISABLED)
+        self.generate_btn.config(state=tk.NORMAL)
+        if self.preflight_pending:
+            self.preflight_pending = False
+            self.start_preflight()
+        if event['event'] == 'error':
+            self.show_error_message(event['error'])
+            self.logger.error(f"Report generation failed: {event['error']}")
+            return
+        summary = event.get('summary') or {}
+        if summary.get('cancelled') or self.cancel_event.is_set():
+            self.show_cancelled_message(event['reports'])
+            self.logger.info(f"Report generation cancelled after {event['reports']} reports")
+        else:
+            self.progress_value.set(100)
+            self.show_success_message(event['reports'])
+            self.logger.info(f"Successfully generated {event['reports']} reports")
+        self.show_batch_summary(summary)
 
     def show_success_message(self, count):
         self.preview_text.config(state=tk.NORMAL)
@@ -280,6 +683,39 @@ class ReportGeneratorUI:
         self.status_var.set(f"Generated {count} reports successfully")
         messagebox.showinfo("Success", f"Generated {count} reports successfully!")
 
+    def show_cancelled_message(self, count):
+        self.preview_text.config(state=tk.NORMAL)
+        self.preview_text.insert(tk.END, f"\n⚠️ Cancelled after {count} reports\n", 'warning')
+        self.preview_text.see(tk.END)
+        self.preview_text.config(state=tk.DISABLED)
+        self.status_var.set(f"Cancelled - {count} reports generated")
+
+    def show_batch_summary(self, summary: Optional[Dict]):
+        if not summary:
+            return
+        self.preview_text.config(state=tk.NORMAL)
+        self.preview_text.insert(tk.END, "\n⏱️ Batch Performance:\n", 'bold')
+        self.preview_text.insert(
+            tk.END,
+            f"   {summary['claims']} claims in {summary['elapsed_seconds']:.1f}s "
+            f"({summary['claims_per_minute']:.1f} claims/min), "
+            f"{summary['bytes_written'] / 1_048_576:.1f} MB written\n"
+        )
+        combined = summary.get('combined_output')
+        if combined:
+            self.preview_text.insert(
+                tk.END,
+                f"   Combined into {Path(combined['path']).name} ({combined['bytes'] / 1_048_576:.1f} MB)\n"
+            )
+        for name, stats in summary['stages'].items():
+            self.preview_text.insert(
+                tk.END,
+                f"   {name:<22} p50 {stats['p50'] * 1000:7.1f} ms   "
+                f"p95 {stats['p95'] * 1000:7.1f} ms   max {stats['max'] * 1000:7.1f} ms\n"
+            )
+        self.preview_text.see(tk.END)
+        self.preview_text.config(state=tk.DISABLED)
+
     def show_error_message(self, error):
         self.preview_text.config(state=tk.NORMAL)
         self.preview_text.insert(tk.END, f"\n❌ Error: {error}\n", 'error')
@@ -302,4 +738,9 @@ class ReportGeneratorUI:
         if self.state['processing']:
             if not messagebox.askokcancel("Reports Generating", "Reports are still being generated. Close anyway?"):
                 return
+            self.cancel_event.set()
+        try:
+            self.preview_html_path.unlink(missing_ok=True)
+        except OSError:
+            pass
         self.root.destroy()
@@ -0,0 +1,213 @@
+"""Throughput benchmarks for the report pipeline: ``python -m benchmarks.run --rows 100,1000``.
+
+Spreadsheets and photo trees are generated into a scratch directory and
+PDF conversion is replaced by a stub renderer, so the numbers cover loading,
+photo discovery and template rendering on any machine. Results are written
+as JSON for comparison between releases.
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from benchmarks.synthetic import write_claims, write_photo_tree
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+BENCHMARKS = ('load_data', 'photo_discovery', 'template_render', 'process_claims')
+
+STUB_PDF = b"%PDF-1.4\n1 0 obj << /Type /Catalog >> endobj\ntrailer << /Root 1 0 R >>\n%%EOF\n"
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.run', description="Benchmark the report pipeline.")
+    parser.add_argument('--rows', default='100,1000,10000', help="Comma separated spreadsheet sizes")
+    parser.add_argument('--format', choices=['csv', 'xlsx'], default='xlsx', help="Synthetic spreadsheet format")
+    parser.add_argument('--depth', type=int, default=0, help="Folder levels above each room folder")
+    parser.add_argument('--photos-per-room', type=int, default=4)
+    parser.add_argument('--image-size', default='800x600', help="Synthetic photo size as WIDTHxHEIGHT")
+    parser.add_argument('--claim-folders', type=int, default=0, help="Claims that get their own photo folder")
+    parser.add_argument('--render-rows', type=int, default=1000,
+                        help="Cap on claims rendered by template_render and process_claims")
+    parser.add_argument('--workers', type=int, default=1, help="RENDER_WORKERS for process_claims")
+    parser.add_argument('--repeat', type=int, default=3, help="Timed runs per benchmark")
+    parser.add_argument('--only', help=f"Comma separated subset of: {', '.join(BENCHMARKS)}")
+    parser.add_argument('--workdir', help="Keep generated fixtures here instead of a temporary directory")
+    parser.add_argument('--output', help="Write the JSON results to this file instead of stdout")
+    return parser
+
+
+class NullRenderer:
+    """Stands in for wkhtmltopdf: writes a fixed minimal PDF so only engine time is measured."""
+
+    name = 'null'
+    batch_size = 1
+
+    def render(self, html: str, output_path: Path):
+        Path(output_path).write_bytes(STUB_PDF)
+
+    def render_batch(self, jobs: List[Tuple[str, Path]]) -> List[Optional[Exception]]:
+        for html, output_path in jobs:
+            self.render(html, output_path)
+        return [None] * len(jobs)
+
+
+def parse_size(value: str) -> Tuple[int, int]:
+    width, _, height = value.lower().partition('x')
+    return int(width), int(height or width)
+
+
+def timed(func: Callable, repeat: int) -> Dict:
+    runs = []
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        func()
+        runs.append(time.perf_counter() - start)
+    return {
+        'runs': [round(seconds, 4) for seconds in runs],
+        'best': round(min(runs), 4),
+        'median': round(statistics.median(runs), 4)
+    }
+
+
+def make_engine(workers: int):
+    from config.settings import CONFIG
+    from app.core.report_engine import InspectionReportEngine
+
+    config = dict(CONFIG)
+    config.update({
+        'RENDER_WORKERS': workers,
+        'INCREMENTAL': False,
+        'IMAGE_OPTIMIZATION': {**CONFIG.get('IMAGE_OPTIMIZATION', {}), 'enabled': False}
+    })
+    engine = InspectionReportEngine(config, renderer=NullRenderer())
+    engine.logger.setLevel('WARNING')
+    return engine
+
+
+def run_size(engine, args, rows: int, data_file: Path, photos_dir: Path, scratch: Path, selected: List[str]) -> List[Dict]:
+    results = []
+    render_rows = min(rows, args.render_rows)
+    render_file = data_file
+    if render_rows < rows:
+        render_file = write_claims(scratch / f"claims_{render_rows}.{args.format}", render_rows)
+
+    def record(name: str, measured_rows: int, timing: Dict):
+        per_row = timing['best'] / measured_rows if measured_rows else 0.0
+        results.append({
+            'benchmark': name,
+            'rows': measured_rows,
+            **timing,
+            'per_row_ms': round(per_row * 1000, 4),
+            'rows_per_second': round(measured_rows / timing['best'], 1) if timing['best'] else None
+        })
+        print(f"{name:>16} {measured_rows:>7} rows  best {timing['best']:.4f}s", file=sys.stderr)
+
+    if 'load_data' in selected:
+        # Untimed first call, so the lazy pandas/openpyxl imports are not counted in the first run.
+        engine._load_data(data_file)
+        record('load_data', rows, timed(lambda: engine._load_data(data_file), args.repeat))
+
+    claims = engine._load_data(render_file)
+    claim_numbers = engine._batch_claim_numbers(engine._claim_sources(render_file), photos_dir)
+
+    if 'photo_discovery' in selected:
+        def discover():
+            engine._refresh_photo_indexes()
+            for claim in claims:
+                engine._prepare_claim_data(claim, photos_dir, claim_numbers)
+        record('photo_discovery', len(claims), timed(discover, args.repeat))
+
+    if 'template_render' in selected:
+        prepared = [engine._prepare_claim_data(claim, photos_dir, claim_numbers) for claim in claims]
+        batch = {'template': engine.template_env.get_template('inspection_template.html'), 'static_sections': {}}
+
+        def render():
+            for claim_data in prepared:
+                engine._build_report_job(claim_data, scratch, batch)
+        record('template_render', len(prepared), timed(render, args.repeat))
+
+    if 'process_claims' in selected:
+        output_dir = scratch / f"output_{rows}"
+        record('process_claims', len(claims),
+               timed(lambda: engine.process_claims(render_file, output_dir, photos_dir, workers=args.workers), args.repeat))
+        summary = engine.last_batch_summary or {}
+        results[-1]['stages'] = {name: stage['p50'] for name, stage in summary.get('stages', {}).items()}
+    return results
+
+
+def environment() -> Dict:
+    info = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine()
+    }
+    try:
+        info['commit'] = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        info['commit'] = None
+    for module in ('pandas', 'openpyxl', 'jinja2', 'PIL'):
+        try:
+            info[module] = __import__(module).__version__
+        except (ImportError, AttributeError):
+            info[module] = None
+    return info
+
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    sizes = [int(size) for size in args.rows.split(',') if size.strip()]
+    selected = [name.strip() for name in args.only.split(',')] if args.only else list(BENCHMARKS)
+    unknown = set(selected) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"Unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    with tempfile.TemporaryDirectory(prefix='inspectionpro-bench-') as tmp:
+        scratch = Path(args.workdir or tmp)
+        scratch.mkdir(parents=True, exist_ok=True)
+        photos = write_photo_tree(
+            scratch / 'photos',
+            depth=args.depth,
+            photos_per_room=args.photos_per_room,
+            image_size=parse_size(args.image_size),
+            claim_folders=args.claim_folders
+        )
+        engine = make_engine(args.workers)
+
+        results = []
+        for rows in sizes:
+            data_file = write_claims(scratch / f"claims_{rows}.{args.format}", rows)
+            results.extend(run_size(engine, args, rows, data_file, Path(photos['root']), scratch, selected))
+
+    payload = {
+        'environment': environment(),
+        'parameters': {
+            'rows': sizes,
+            'format': args.format,
+            'render_rows': args.render_rows,
+            'workers': args.workers,
+            'repeat': args.repeat,
+            'photos': photos
+        },
+        'results': results
+    }
+    text = json.dumps(payload, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + '\n', encoding='utf-8')
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,148 @@
+"""Synthetic claim spreadsheets and photo trees for the benchmarks."""
+import csv
+import random
+import struct
+import zlib
+from pathlib import Path
+from typing import Dict, List, Tuple, Union
+
+try:
+    from PIL import Image
+except ImportError:  # Without Pillow photos are written as flat-colour PNGs
+    Image = None
+
+COLUMNS = [
+    'INSURED/POLICYHOLDER', 'ADDRESS', 'INSURER', 'CLAIM #', 'ADJUSTER/ CLAIM REP',
+    'DATE OF INSPECTION', 'DATE OF LOSS', 'DATE OF REPORT', 'TYPE OF LOSS',
+    'CAUSE OF LOSS', 'SCOPE OF WORK'
+]
+
+FIRST_NAMES = ['ABIGAIL', 'MICHAEL', 'PRIYA', 'DANIEL', 'SOFIA', 'OMAR', 'GRACE', 'LIAM', 'MEI', 'NOAH']
+LAST_NAMES = ['CARTER', 'LEE', 'SHARMA', 'NGUYEN', 'ROSSI', 'KHAN', 'WILSON', 'TREMBLAY', 'CHEN', 'SINGH']
+CITIES = ['SCARBOROUGH, ON M1C 2Z3', 'MISSISSAUGA, ON L5N 3T4', 'BRAMPTON, ON L6T 1S9', 'OAKVILLE, ON L6H 0A1']
+INSURERS = ['ABC INSURANCE', 'GUARDIAN CO.', 'NORTHERN MUTUAL', 'MAPLE GENERAL']
+ADJUSTERS = ['NOVA CLAIMS', 'TOP GUN', 'CROWN ADJUSTERS']
+LOSSES = [
+    ('WATER DAMAGE', "The loss was caused by a burst pipe on the second floor which led to flooding in multiple rooms."),
+    ('FIRE', "The loss was caused by a kitchen fire that spread to the living room before being contained."),
+    ('WIND', "High winds lifted shingles and allowed rain into the attic and upper bedrooms.")
+]
+MONTHS = ['JANUARY', 'FEBRUARY', 'MARCH', 'APRIL', 'MAY', 'JUNE']
+
+ROOM_FOLDERS = ['bedroom1', 'bedroom2', 'kitchen', 'living', 'storage']
+
+
+def claim_number(index: int) -> str:
+    return f"PR{100000 + index}"
+
+
+def claim_rows(rows: int, seed: int = 0) -> List[Dict]:
+    rng = random.Random(seed)
+    records = []
+    for index in range(rows):
+        loss_type, cause = rng.choice(LOSSES)
+        month = rng.choice(MONTHS)
+        day = rng.randint(1, 20)
+        records.append({
+            'INSURED/POLICYHOLDER': f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            'ADDRESS': rng.choice(CITIES),
+            'INSURER': rng.choice(INSURERS),
+            'CLAIM #': claim_number(index),
+            'ADJUSTER/ CLAIM REP': rng.choice(ADJUSTERS),
+            'DATE OF INSPECTION': f"{month} {day + 3}, 2025",
+            'DATE OF LOSS': f"{month} {day}, 2025",
+            'DATE OF REPORT': f"{month} {day + 6}, 2025",
+            'TYPE OF LOSS': loss_type,
+            'CAUSE OF LOSS': cause,
+            'SCOPE OF WORK': "\n".join(f"{step}. Step {step} of the restoration." for step in range(1, 6))
+        })
+    return records
+
+
+def write_claims(path: Union[str, Path], rows: int, seed: int = 0) -> Path:
+    """Write ``rows`` synthetic claims as .csv or .xlsx, chosen by the file suffix."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    records = claim_rows(rows, seed)
+    if path.suffix.lower() == '.csv':
+        with open(path, 'w', encoding='utf-8', newline='') as handle:
+            writer = csv.DictWriter(handle, fieldnames=COLUMNS)
+            writer.writeheader()
+            writer.writerows(records)
+    elif path.suffix.lower() == '.xlsx':
+        import openpyxl
+        workbook = openpyxl.Workbook(write_only=True)
+        sheet = workbook.create_sheet()
+        sheet.append(COLUMNS)
+        for record in records:
+            sheet.append([record[column] for column in COLUMNS])
+        workbook.save(path)
+    else:
+        raise ValueError(f"Unsupported synthetic data format: {path.suffix}")
+    return path
+
+
+def _png_bytes(size: Tuple[int, int], colour: Tuple[int, int, int]) -> bytes:
+    width, height = size
+    row = b'\x00' + bytes(colour) * width
+    raw = zlib.compress(row * height)
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data) & 0xffffffff)
+
+    header = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    return b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', header) + chunk(b'IDAT', raw) + chunk(b'IEND', b'')
+
+
+def write_image(path: Path, size: Tuple[int, int], rng: random.Random) -> Path:
+    colour = (rng.randrange(256), rng.randrange(256), rng.randrange(256))
+    if Image is not None:
+        image = Image.new('RGB', size, colour)
+        # Noise keeps JPEG sizes close to real photos instead of a few hundred bytes.
+        noise = Image.effect_noise(size, 64).convert('RGB')
+        Image.blend(image, noise, 0.5).save(path, 'JPEG' if path.suffix.lower() != '.png' else 'PNG', quality=85)
+    else:
+        path = path.with_suffix('.png')
+        path.write_bytes(_png_bytes(size, colour))
+    return path
+
+
+def write_photo_tree(root: Union[str, Path], depth: int = 0, photos_per_room: int = 4,
+                     image_size: Tuple[int, int] = (800, 600), claim_folders: int = 0,
+                     seed: int = 0) -> Dict:
+    """Create a photos directory shaped like the real one.
+
+    Room folders are nested ``depth`` levels below the root (or below each
+    claim folder), so directory walking cost can be scaled independently of
+    the number of images. The first ``claim_folders`` claims get their own
+    sub-folder named after their claim number.
+    """
+    root = Path(root)
+    rng = random.Random(seed)
+    images = 0
+
+    root.mkdir(parents=True, exist_ok=True)
+    write_image(root / 'header.png', (1100, 130), rng)
+    write_image(root / 'footer.png', (1100, 130), rng)
+    images += 2
+
+    def populate(base: Path):
+        nonlocal images
+        nested = base
+        for level in range(depth):
+            nested = nested / f"level{level + 1}"
+        for room in ROOM_FOLDERS:
+            room_dir = nested / room
+            room_dir.mkdir(parents=True, exist_ok=True)
+            for number in range(photos_per_room):
+                write_image(room_dir / f"Picture{number + 1}.jpg", image_size, rng)
+                images += 1
+        write_image(base / 'front_house.jpg', image_size, rng)
+        images += 1
+
+    populate(root)
+    for index in range(claim_folders):
+        populate(root / claim_number(index))
+
+    return {'root': str(root), 'images': images, 'depth': depth, 'claim_folders': claim_folders}
+
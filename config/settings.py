@@ -2,6 +2,7 @@ import os
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
+CACHE_DIR = os.path.join(os.environ.get('LOCALAPPDATA') or os.path.join(Path.home(), '.cache'), 'InspectionPro')
 
 CONFIG = {
     'TEMPLATES_DIR': 'path/to/templates',
@@ -14,6 +15,7 @@ CONFIG = {
     'TEMPLATES_DIR': os.path.join(BASE_DIR, 'app/templates'),
     'ASSETS_DIR': os.path.join(BASE_DIR, 'assets'),
     'OUTPUT_DIR': os.path.join(BASE_DIR, 'outputs'),
+    'TEMPLATE_CACHE_DIR': os.path.join(CACHE_DIR, 'templates'),  # Compiled template bytecode
     'COMPANY_INFO': {
         'name': 'Your Company',
         'logo': 'company_logo.png',
@@ -26,5 +28,77 @@ CONFIG = {
         'default_margins': '15mm',
         'header_height': '20mm',
         'footer_height': '10mm'
+    },
+    'LOAD_CHUNK_SIZE': 500,  # Claim rows read from the spreadsheet per chunk
+    'INGEST': {
+        'all_sheets': True,  # Read every sheet with a CLAIM # column, not only the first
+        'duplicates': 'last',  # last | first: which row is kept when a claim number repeats across files or sheets; a single streamed file always keeps the first
+        'workers': 4,  # Input files parsed concurrently
+        'cache': False,  # Keep parsed files keyed by their hash so unchanged ones are not parsed again (requires pyarrow)
+        'cache_format': 'parquet',  # parquet | feather
+        'cache_dir': os.path.join(CACHE_DIR, 'claims')
+    },
+    'RENDER_WORKERS': 1,  # Claims rendered concurrently, each in its own wkhtmltopdf process
+    'INCREMENTAL': False,  # Skip claims whose data, photos, template and config are unchanged
+    'RESUME_BATCHES': True,  # Journal finished claims so an interrupted batch resumes where it stopped
+    'DETERMINISTIC_REPORTS': False,  # Derive report IDs, reserves and timestamps from the claim data and fix PDF dates, so re-renders are byte-identical
+    'PDF_BACKEND': 'auto',  # auto | pdfkit | wkhtmltopdf-batch | xhtml2pdf
+    'PDF_BATCH_SIZE': 8,  # Reports converted per wkhtmltopdf process by the batch backend
+    'WATCH': {
+        'poll_seconds': 2.0,  # How often the inbox and photos directory are checked
+        'settle_seconds': 5.0  # Files must be unchanged this long before a job starts
+    },
+    'OUTPUT_WRITER': {
+        'backend': 'local',  # local | background (copy to the output folder on separate threads)
+        'scratch_dir': None,  # Local folder reports are rendered into first; None uses the system temp folder
+        'workers': 2,  # Copy threads for the background backend
+        'max_pending': 16  # Reports allowed to wait for a copy thread before rendering pauses
+    },
+    'BATCH_OUTPUT': {
+        'mode': 'separate',  # separate | merged-pdf (one PDF, bookmark per claim) | zip
+        'filename': 'INSPECTION REPORTS - %Y-%m-%d %H%M%S',  # strftime pattern, extension is added
+        'merge_slice': 100  # Reports a merged PDF holds in memory before they are written to a slice on disk
+    },
+    'PHOTO_INDEX': {
+        'check_mtime': False  # Keep photo indexes between runs, rescanning only changed folders
+    },
+    'CLAIM_PHOTO_FOLDERS': {
+        'enabled': True,  # Top-level photo folders named after a claim number hold that claim's photos
+        'pattern': r'^[A-Za-z]{0,4}[-_ ]?\d{3,}'
+    },
+    'ROOM_RULES': {
+        # Each photo goes to the highest priority room whose keywords (plain text) or
+        # patterns (regular expressions) occur in its file name or folder name.
+        'rooms': [
+            {'room': 'BEDROOM1', 'keywords': ['bedroom1', 'master']},
+            {'room': 'BEDROOM2', 'keywords': ['bedroom2', 'second']},
+            {'room': 'KITCHEN', 'keywords': ['kitchen']},
+            {'room': 'LIVING', 'keywords': ['living', 'lounge']},
+            {'room': 'STORAGE', 'keywords': ['storage', 'basement']}
+        ],
+        'max_photos': 4,  # Photos per room unless a rule sets its own 'max_photos'
+        'uncategorized': 'OTHER'  # Room for photos no rule matches; None leaves them out
+    },
+    'PREFLIGHT': {
+        'min_image_px': (200, 150),  # Smaller photos are reported as low resolution
+        'workers': 8  # Images checked concurrently
+    },
+    'RESOURCE_BUNDLE': {
+        'enabled': True,  # Embed images as data URIs, each file read once instead of once per report
+        'max_mb': 256  # Memory kept for encoded images; least recently used are dropped first
+    },
+    'PREVIEW': {
+        'cache_dir': os.path.join(CACHE_DIR, 'previews'),  # Thumbnails for the claim preview (requires Pillow)
+        'dpi': 48,  # Thumbnails are scaled to their printed size at this resolution
+        'quality': 60,
+        'refresh_seconds': 1.0  # How often the GUI checks the data file, photos and templates for changes
+    },
+    'IMAGE_OPTIMIZATION': {
+        'enabled': True,  # Requires Pillow; falls back to the original photos otherwise
+        'cache_dir': os.path.join(CACHE_DIR, 'images'),
+        'dpi': 150,
+        'quality': 80,
+        'photo_size_in': (3.25, 2.25),
+        'banner_size_in': (8.27, 0.79)
     }
 }
\ No newline at end of file
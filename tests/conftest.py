@@ -0,0 +1,25 @@
+import pytest
+
+from app.core.renderers import PdfRenderer
+from app.core.report_engine import InspectionReportEngine
+from config.settings import CONFIG
+
+
+class NullRenderer(PdfRenderer):
+    name = 'null'
+
+    def render(self, html: str, output_path):
+        with open(output_path, 'wb') as handle:
+            handle.write(b'%PDF-1.4\n')
+
+
+@pytest.fixture
+def engine(tmp_path):
+    config = dict(
+        CONFIG,
+        TEMPLATE_CACHE_DIR=str(tmp_path / 'template-cache'),
+        IMAGE_OPTIMIZATION={**CONFIG['IMAGE_OPTIMIZATION'], 'enabled': False},
+        PREVIEW={**CONFIG['PREVIEW'], 'cache_dir': str(tmp_path / 'previews')},
+        INGEST={**CONFIG['INGEST'], 'cache_dir': str(tmp_path / 'claims')}
+    )
+    return InspectionReportEngine(config, renderer=NullRenderer())
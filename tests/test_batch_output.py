@@ -0,0 +1,34 @@
+import pytest
+
+from app.core.batch_output import MergedPdfOutput
+
+pypdf = pytest.importorskip('pypdf')
+
+
+def report(path):
+    writer = pypdf.PdfWriter()
+    writer.add_blank_page(width=200, height=200)
+    writer.add_blank_page(width=200, height=200)
+    with open(path, 'wb') as handle:
+        writer.write(handle)
+    return path
+
+
+def test_merged_pdf_written_in_slices_keeps_every_report_and_bookmark(tmp_path):
+    output = MergedPdfOutput(tmp_path / 'batch.pdf', slice_size=2)
+    for number in range(5):
+        output.add(report(tmp_path / f"claim{number}.pdf"), f"Claim {number}")
+    assert len(output.slices) == 2
+
+    merged = pypdf.PdfReader(output.close())
+    assert len(merged.pages) == 10
+    assert [item.title for item in merged.outline] == [f"Claim {number}" for number in range(5)]
+    assert [merged.get_destination_page_number(item) for item in merged.outline] == [0, 2, 4, 6, 8]
+    assert not list(tmp_path.glob('batch.pdf.part*'))
+
+
+def test_abort_removes_slices(tmp_path):
+    output = MergedPdfOutput(tmp_path / 'batch.pdf', slice_size=1)
+    output.add(report(tmp_path / 'claim.pdf'), 'Claim')
+    output.abort()
+    assert not list(tmp_path.glob('batch.pdf*'))
@@ -0,0 +1,91 @@
+from datetime import datetime
+
+import openpyxl
+import pandas as pd
+import pytest
+
+from app.core.claim_sources import resolve_data_files
+
+HEADER = ['CLAIM #', 'INSURED/POLICYHOLDER', 'ADDRESS', 'YEAR BUILT', 'VACANT', 'DATE OF LOSS']
+
+
+def write_csv(path, rows, columns=HEADER):
+    pd.DataFrame(rows, columns=columns).to_csv(path, index=False)
+    return path
+
+
+def write_workbook(path, sheets):
+    workbook = openpyxl.Workbook()
+    workbook.remove(workbook.active)
+    for title, rows in sheets.items():
+        sheet = workbook.create_sheet(title)
+        for row in rows:
+            sheet.append(row)
+    workbook.save(path)
+    return path
+
+
+def test_combines_files_with_numeric_bool_and_date_columns(engine, tmp_path):
+    first = write_csv(tmp_path / 'a.csv', [
+        ['PR1', 'Ann Lee', '1 Main St', 1988, True, '2024-01-05'],
+        ['PR2', 'Bo Chan', '2 Main St', None, False, None]
+    ])
+    second = write_workbook(tmp_path / 'b.xlsx', {
+        'Adjuster 1': [
+            ['claim # ', 'INSURED/POLICYHOLDER', 'ADDRESS', 'YEAR BUILT', 'VACANT', 'DATE OF LOSS'],
+            ['PR3', 'Cy Diaz', '3 Main St', 2001, None, datetime(2024, 2, 1)]
+        ],
+        'Adjuster 2': [
+            HEADER[:4],
+            ['PR4', 'Di Eng', '4 Main St', 1975]
+        ],
+        'Notes': [['NOTE'], ['not a claim']]
+    })
+
+    claims = engine._load_data([first, second])
+
+    assert [claim['CLAIM #'] for claim in claims] == ['PR1', 'PR2', 'PR3', 'PR4']
+    assert [claim['YEAR BUILT'] for claim in claims] == [1988, None, 2001, 1975]
+    assert [claim['VACANT'] for claim in claims] == [True, False, None, None]
+    assert claims[2]['DATE OF LOSS'] == datetime(2024, 2, 1)
+    assert claims[3]['DATE OF LOSS'] is None
+
+
+def test_duplicate_claim_numbers_keep_later_row(engine, tmp_path):
+    first = write_csv(tmp_path / 'a.csv', [['PR1', 'Old Name', '1 Main St', 1988, True, None]])
+    second = write_workbook(tmp_path / 'b.xlsx', {
+        'Claims': [HEADER, [' pr1 ', 'New Name', '1 Main St', 1988, True, None], ['PR2', 'Bo Chan', '2 Main St', 1990, False, None]]
+    })
+
+    claims = engine._load_data([first, second])
+
+    assert [claim['INSURED/POLICYHOLDER'] for claim in claims] == ['New Name', 'Bo Chan']
+
+
+def test_resolves_folders_and_globs_in_order(tmp_path):
+    for name in ('b.csv', 'a.xlsx', '~$a.xlsx', 'notes.txt'):
+        (tmp_path / name).write_bytes(b'')
+    assert [path.name for path in resolve_data_files(tmp_path)] == ['a.xlsx', 'b.csv']
+    assert [path.name for path in resolve_data_files(str(tmp_path / '*.csv'))] == ['b.csv']
+    with pytest.raises(FileNotFoundError):
+        resolve_data_files(str(tmp_path / '*.json'))
+
+
+@pytest.mark.parametrize('split', [False, True])
+def test_repeated_claim_numbers_are_rendered_once(engine, tmp_path, split):
+    rows = [['PR1', 'Ann Lee', '1 Main St', 1988, True, None],
+            ['pr1 ', 'Ann Lee', '1 Main Street', 1988, True, None],
+            ['PR2', 'Bo Chan', '2 Main St', None, False, None]]
+    if split:
+        files = [write_csv(tmp_path / 'a.csv', rows[:1]), write_csv(tmp_path / 'b.csv', rows[1:])]
+    else:
+        files = [write_csv(tmp_path / 'a.csv', rows)]
+
+    claims = engine._load_data(files)
+    assert [claim['CLAIM #'].strip().upper() for claim in claims] == ['PR1', 'PR2']
+    assert claims[0]['ADDRESS'] == ('1 Main Street' if split else '1 Main St')
+
+    report = engine.preflight(files)
+    assert [(problem['claim'], problem['message']) for problem in report['warnings']] == [
+        ('PR1', f"Claim number appears in more than one row; only the {'last' if split else 'first'} is rendered")
+    ]
@@ -0,0 +1,32 @@
+import io
+
+import pytest
+
+from app.core.image_cache import ImageCache
+
+Image = pytest.importorskip('PIL.Image')
+
+
+def test_images_that_do_not_shrink_are_remembered_across_instances(tmp_path, monkeypatch):
+    banner = tmp_path / 'header.png'
+    Image.new('RGB', (40, 10), (200, 30, 30)).save(banner, format='PNG', optimize=True)
+
+    assert ImageCache(tmp_path / 'cache').get(banner, (1, 1)) == str(banner)
+
+    def encode(*args):
+        raise AssertionError("image was encoded again")
+
+    fresh = ImageCache(tmp_path / 'cache')
+    monkeypatch.setattr(fresh, '_encode', encode)
+    assert fresh.get(banner, (1, 1)) == str(banner)
+
+
+def test_smaller_encodings_are_cached(tmp_path):
+    photo = tmp_path / 'photo.jpg'
+    buffer = io.BytesIO()
+    Image.effect_noise((800, 600), 64).convert('RGB').save(buffer, format='JPEG', quality=95)
+    photo.write_bytes(buffer.getvalue())
+
+    cached = ImageCache(tmp_path / 'cache', dpi=50).get(photo, (2, 1.5))
+    assert cached != str(photo)
+    assert Image.open(cached).size == (100, 75)
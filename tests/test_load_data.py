@@ -0,0 +1,44 @@
+from datetime import time
+from decimal import Decimal
+
+import openpyxl
+import pandas as pd
+
+from app.core.report_engine import InspectionReportEngine
+
+
+def write_workbook(path, rows):
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    for row in rows:
+        sheet.append(row)
+    workbook.save(path)
+    return path
+
+
+def test_normalize_blanks_keeps_non_text_object_columns():
+    df = pd.DataFrame({
+        'TEXT': ['a', '  ', None],
+        'FLAG': [True, None, False],
+        'AMOUNT': [Decimal('1.50'), None, Decimal('0')],
+        'START': [time(9, 30), None, time(0, 0)],
+        'MIXED': ['  ', 3, ' x ']
+    })
+    records = InspectionReportEngine._normalize_blanks(df).to_dict('records')
+    assert [record['TEXT'] for record in records] == ['a', None, None]
+    assert [record['FLAG'] for record in records] == [True, None, False]
+    assert [record['AMOUNT'] for record in records] == [Decimal('1.50'), None, Decimal('0')]
+    assert [record['START'] for record in records] == [time(9, 30), None, time(0, 0)]
+    assert [record['MIXED'] for record in records] == [None, 3, ' x ']
+
+
+def test_workbook_with_bool_column_loads(engine, tmp_path):
+    path = write_workbook(tmp_path / 'claims.xlsx', [
+        ['CLAIM #', 'INSURED/POLICYHOLDER', 'ADDRESS', 'VACANT', 'NOTES'],
+        ['PR1', 'Ann Lee', '1 Main St', True, 'ok'],
+        ['PR2', 'Bo Chan', '2 Main St', None, '  '],
+        ['PR3', 'Cy Diaz', '3 Main St', True, None]
+    ])
+    claims = engine._load_data(path)
+    assert [claim['VACANT'] for claim in claims] == [True, None, True]
+    assert [claim['NOTES'] for claim in claims] == ['ok', None, None]
@@ -0,0 +1,72 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from app.core.photo_index import PhotoIndex
+from config.settings import CONFIG
+
+PATTERN = CONFIG['CLAIM_PHOTO_FOLDERS']['pattern']
+
+
+def photo(path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b'')
+    return path
+
+
+def photo_tree(root):
+    photo(root / 'kitchen' / 'shared.jpg')
+    photo(root / '2024' / 'living' / 'year.jpg')
+    photo(root / 'Unit 204 kitchen' / 'unit.jpg')
+    photo(root / '100CANON' / 'camera.jpg')
+    photo(root / 'PR1923' / 'kitchen' / 'claim.jpg')
+    return root
+
+
+def test_only_folders_of_batch_claims_are_claim_folders(tmp_path):
+    root = photo_tree(tmp_path / 'photos')
+    index = PhotoIndex(root, PATTERN, claim_numbers={'PR1923', 'PR2000'})
+
+    assert index.claim_folder('PR-1923') == root / 'PR1923'
+    assert sorted(path.name for path in index.unclaimed_folders) == ['100CANON', '2024', 'Unit 204 kitchen']
+    names = {path.name for path in index.files}
+    assert {'shared.jpg', 'year.jpg', 'unit.jpg', 'camera.jpg'} <= names
+    assert 'claim.jpg' not in names
+
+
+def test_engine_keeps_non_claim_folders_shared(engine, tmp_path):
+    root = photo_tree(tmp_path / 'photos')
+    data_file = tmp_path / 'claims.csv'
+    pd.DataFrame({'CLAIM #': ['PR1923', 'PR2000']}).to_csv(data_file, index=False)
+
+    claim_numbers = engine._batch_claim_numbers(engine._claim_sources(data_file), root)
+    assert claim_numbers == {'PR1923', 'PR2000'}
+
+    def images(claim_number):
+        claim_data = engine._prepare_claim_data({'CLAIM #': claim_number}, root, claim_numbers)
+        return {Path(name).name for room in claim_data['photos'] for name in room['images']}
+
+    assert images('PR1923') == {'claim.jpg'}
+    assert {'shared.jpg', 'year.jpg', 'unit.jpg', 'camera.jpg'} <= images('PR2000')
+
+
+@pytest.mark.parametrize('suffix', ['.csv', '.xlsx'])
+def test_batch_reads_claim_numbers_without_loading_claims_twice(engine, tmp_path, monkeypatch, suffix):
+    root = photo_tree(tmp_path / 'photos')
+    frame = pd.DataFrame({'INSURED/POLICYHOLDER': ['Ann Lee', 'Bo Chan'], 'CLAIM #': ['PR1923', 'PR2000'],
+                          'ADDRESS': ['1 Main St', '2 Main St']})
+    data_file = tmp_path / f"claims{suffix}"
+    if suffix == '.csv':
+        frame.to_csv(data_file, index=False)
+    else:
+        frame.to_excel(data_file, index=False)
+
+    passes = []
+    iter_claims = engine._iter_claims
+    monkeypatch.setattr(engine, '_iter_claims', lambda *args, **kwargs: passes.append(1) or iter_claims(*args, **kwargs))
+    engine.process_claims(data_file, tmp_path / 'out', root)
+
+    assert len(passes) == 1
+    assert engine.last_batch_summary['generated'] == 2
+    assert engine.claim_numbers(data_file) == {'PR1923', 'PR2000'}
@@ -0,0 +1,19 @@
+import pandas as pd
+
+from app.core.journal import CheckpointJournal
+
+
+def test_finished_batch_with_failed_row_is_not_resumed(engine, tmp_path):
+    data_file = tmp_path / 'claims.csv'
+    pd.DataFrame({
+        'CLAIM #': ['PR1001', 'PR1002', 'PR1003'],
+        'INSURED/POLICYHOLDER': ['Ann Lee', None, 'Cy Diaz'],
+        'ADDRESS': ['1 Main St', '2 Main St', '3 Main St']
+    }).to_csv(data_file, index=False)
+    output_dir = tmp_path / 'out'
+
+    for _ in range(2):
+        engine.process_claims(data_file, output_dir)
+        summary = engine.last_batch_summary
+        assert (summary['generated'], summary['failed'], summary['skipped']) == (2, 1, 0)
+        assert not (output_dir / CheckpointJournal.FILENAME).exists()
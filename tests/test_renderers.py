@@ -0,0 +1,17 @@
+from app.core.renderers import stabilize_pdf_dates
+
+PDF = (b"%PDF-1.4\n1 0 obj\n<< /Title (Report) /CreationDate (D:20261017182014+02'00') >>\nendobj\n"
+       b"xref\n0 2\ntrailer << /Info 1 0 R >>\n%%EOF\n")
+
+
+def test_pdf_dates_are_fixed_without_moving_offsets(tmp_path):
+    first, second = tmp_path / 'first.pdf', tmp_path / 'second.pdf'
+    first.write_bytes(PDF)
+    second.write_bytes(PDF.replace(b'20261017182014', b'20261018091502'))
+
+    stabilize_pdf_dates(first)
+    stabilize_pdf_dates(second)
+
+    assert first.read_bytes() == second.read_bytes()
+    assert len(first.read_bytes()) == len(PDF)
+    assert b"/CreationDate (D:19700101000000+00'00')" in first.read_bytes()
@@ -0,0 +1,44 @@
+import shutil
+
+import jinja2
+
+from app.core.template_cache import TemplateBytecodeCache
+
+
+def render_from(templates_dir, cache_dir):
+    env = jinja2.Environment(loader=jinja2.FileSystemLoader(str(templates_dir)),
+                             bytecode_cache=TemplateBytecodeCache(str(cache_dir)))
+    return env.get_template('report.html').render(name='x')
+
+
+def test_cache_is_shared_between_template_folders(tmp_path):
+    cache_dir = tmp_path / 'cache'
+    cache_dir.mkdir()
+    for launch in ('_MEI1', '_MEI2', '_MEI3'):
+        templates = tmp_path / launch
+        templates.mkdir()
+        (templates / 'report.html').write_text('Hello {{ name }}')
+        assert render_from(templates, cache_dir) == 'Hello x'
+        shutil.rmtree(templates)
+    assert len(list(cache_dir.iterdir())) == 1
+
+
+def test_changed_source_is_recompiled(tmp_path):
+    cache_dir = tmp_path / 'cache'
+    cache_dir.mkdir()
+    templates = tmp_path / 'templates'
+    templates.mkdir()
+    (templates / 'report.html').write_text('Hello {{ name }}')
+    render_from(templates, cache_dir)
+    (templates / 'report.html').write_text('Bye {{ name }}')
+    assert render_from(templates, cache_dir) == 'Bye x'
+
+
+def test_prune_removes_entries_for_unknown_keys(tmp_path):
+    cache = TemplateBytecodeCache(str(tmp_path))
+    (tmp_path / '__jinja2_deadbeef.cache').write_bytes(b'old')
+    current = tmp_path / (cache.pattern % cache.get_cache_key('report.html'))
+    current.write_bytes(b'new')
+    (tmp_path / 'unrelated.txt').write_bytes(b'')
+    assert cache.prune(['report.html']) == 1
+    assert sorted(path.name for path in tmp_path.iterdir()) == sorted([current.name, 'unrelated.txt'])
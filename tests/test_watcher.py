@@ -0,0 +1,55 @@
+import pandas as pd
+import pytest
+
+from app.core.watcher import InboxWatcher
+
+
+@pytest.fixture
+def watcher(engine, tmp_path, monkeypatch):
+    jobs = []
+    monkeypatch.setattr(engine, 'process_claims', lambda path, *args, **kwargs: jobs.append(path.name) or [])
+    (tmp_path / 'inbox').mkdir()
+    (tmp_path / 'photos' / 'kitchen').mkdir(parents=True)
+    watcher = InboxWatcher(engine, tmp_path / 'inbox', tmp_path / 'out', tmp_path / 'photos', settle_seconds=5)
+    watcher.jobs = jobs
+    return watcher
+
+
+def drop(watcher, name, claims):
+    pd.DataFrame({'CLAIM #': claims}).to_csv(watcher.inbox / name, index=False)
+
+
+def add_photo(watcher, relative):
+    path = watcher.photos_dir / relative
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b'')
+
+
+def test_claim_folder_copy_only_holds_back_its_own_spreadsheet(watcher):
+    add_photo(watcher, 'PR1001/kitchen/a.jpg')
+    add_photo(watcher, 'PR1002/kitchen/a.jpg')
+    drop(watcher, 'first.csv', ['PR1001'])
+    drop(watcher, 'second.csv', ['PR1002'])
+    watcher.poll_once(now=0)
+    assert watcher.poll_once(now=10) == [watcher.inbox / 'first.csv', watcher.inbox / 'second.csv']
+
+    drop(watcher, 'third.csv', ['PR1001'])
+    watcher.poll_once(now=11)
+    add_photo(watcher, 'PR1002/kitchen/b.jpg')
+    watcher.poll_once(now=14)
+    # PR1002 is still being copied, which only the spreadsheet with that claim waits for.
+    assert watcher.poll_once(now=16) == [watcher.inbox / 'third.csv']
+    assert watcher.poll_once(now=20) == [watcher.inbox / 'second.csv']
+    assert watcher.poll_once(now=30) == []
+
+
+def test_shared_photo_change_rechecks_every_spreadsheet(watcher):
+    drop(watcher, 'first.csv', ['PR1001'])
+    drop(watcher, 'second.csv', ['PR1002'])
+    watcher.poll_once(now=0)
+    watcher.poll_once(now=10)
+
+    add_photo(watcher, 'kitchen/new.jpg')
+    watcher.poll_once(now=11)
+    assert watcher.poll_once(now=16) == [watcher.inbox / 'first.csv', watcher.inbox / 'second.csv']
+    assert watcher.jobs == ['first.csv', 'second.csv'] * 2